@@ -3,8 +3,8 @@ from setuptools import setup, find_packages
 
 
 # check python version
-if sys.version_info < (3, 5, 4):
-    sys.exit('Python < 3.5.4 is not supported.')
+if sys.version_info < (3, 7):
+    sys.exit('Python < 3.7 is not supported.')
 
 setup(
     name='nest',
@@ -16,6 +16,7 @@ setup(
     license='MIT',
     packages=find_packages('src'),
     package_dir={'': 'src'},
+    python_requires='>=3.7',
     install_requires=[
         'PyYAML',
         'python-dateutil'
@@ -1,4 +1,4 @@
-from nest.parser import run_tasks
+from nest.parser import run_tasks, arun_tasks
 from nest.modules import Context, ModuleManager, module_manager
 
 
@@ -6,4 +6,4 @@ from nest.modules import Context, ModuleManager, module_manager
 modules = module_manager
 register = ModuleManager._register
 
-__all__ = ['Context', 'modules', 'register', 'run_tasks']
+__all__ = ['Context', 'modules', 'register', 'run_tasks', 'arun_tasks']
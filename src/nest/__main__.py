@@ -1,7 +1,15 @@
+import sys
+
 from nest.cli import CLI
+from nest.daemon import forward
 
 def main():
-    CLI()
+    # use the daemon if it is running
+    code = forward(sys.argv[1:])
+    if code is None:
+        CLI()
+    else:
+        sys.exit(code)
 
 
 if __name__ == '__main__':
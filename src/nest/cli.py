@@ -110,13 +110,51 @@ class CLI(object):
         parser_run.add_argument('-p', '--param', default=None,
             help='Path to the parameter file that can be used for hyper-params tuning.')
         parser_run.add_argument('-v', '--verbose', action='store_true', help='Show verbose information.')
+        parser_run.add_argument('-t', '--trace', default=None, 
+            help='Save the timeline of config resolution to a Chrome Trace (Perfetto) JSON file.')
+        parser_run.add_argument('-a', '--async', dest='async_mode', action='store_true', 
+            help='Await async Nest modules and resolve independent ones concurrently.')
+        parser_run.add_argument('-s', '--status', default=None, 
+            help='Refresh the progress of trials (done, failed, ETA, memory) in a JSON file.')
+        parser_run.add_argument('--metrics-port', type=int, default=None, 
+            help='Serve the progress in Prometheus text format on http://127.0.0.1:PORT/metrics.')
+        parser_run.add_argument('-i', '--isolated', action='store_true', 
+            help='Resolve each trial in a fresh child process so that its memory is fully released.')
+
+        # query results
+        parser_results = subparsers.add_parser('results', help='Query results of tasks.')
+        parser_results.add_argument('db', metavar='DB', nargs='?', default=None, 
+            help='Path to the results database (default: settings["RESULTS_DB"], or "nest_results.db", in the current directory).')
+        parser_results.add_argument('-w', '--where', action='append', default=[], 
+            help='Filter by a column, e.g., "lr>=0.01", "status=failed", or "model~resnet". Could be repeated.')
+        parser_results.add_argument('-s', '--sort', default=None, help='Sort by a column (descending if prefixed by "-", e.g., --sort=-acc).')
+        parser_results.add_argument('-n', '--limit', type=int, default=None, help='Max number of trials.')
+        parser_results.add_argument('-c', '--columns', default=None, 
+            help='Comma-separated columns to show (default: trial, status, elapsed, params, and metrics).')
+        parser_results.add_argument('-f', '--format', default='table', choices=['table', 'csv', 'json'], help='Output format.')
+        parser_results.add_argument('-o', '--output', default=None, help='Export to the file instead of printing.')
         args = parser.parse_args(arguments)
 
         # exception formatter
         self.hook_exceptions(logger)
 
         if args.command == 'run':
-            run_tasks(args.config, args.param, args.verbose)
+            run_tasks(args.config, args.param, args.verbose, args.trace, args.async_mode, args.status, args.metrics_port, args.isolated)
+        elif args.command == 'results':
+            from nest import results
+            rows = results.query(args.db or settings['RESULTS_DB'] or 'nest_results.db', args.where, args.sort, args.limit)
+            if args.columns:
+                columns = [v.strip() for v in args.columns.split(',')]
+            else:
+                columns = ['trial', 'status', 'elapsed']
+                for row in rows:
+                    columns += [k for k in row.keys() if not k in columns and not k in results.COLUMNS]
+            if args.output:
+                with open(args.output, 'w', newline='') as f:
+                    results.export(rows, columns, args.format, f)
+                logger.info('Exported %d trials to "%s".' % (len(rows), args.output))
+            else:
+                results.export(rows, columns, args.format, sys.stdout)
         else:
             parser.print_help()
 
@@ -146,11 +184,31 @@ class CLI(object):
         parser_pack = subparsers.add_parser('pack', help='Pack modules.')
         parser_pack.add_argument('path', metavar='PATH', nargs='+', help='Path to namespaces.')
         parser_pack.add_argument('-s', '--save', default='./nest_modules.zip', help='Save path (default: ./nest_modules.zip).')
+        parser_pack.add_argument('-j', '--jobs', type=int, default=None, help='Number of compression threads (default: number of CPUs).')
         parser_pack.add_argument('-y', '--yes', action='store_true', help='Skip confirmation.')
+        # bundle modules
+        parser_bundle = subparsers.add_parser('bundle', help='Build precompiled bundle of namespaces.')
+        parser_bundle.add_argument('src', metavar='SRC', nargs='+', help='Installed namespaces or path to namespaces.')
+        parser_bundle.add_argument('-s', '--save', default='./nest_bundle.zip', help='Save path (default: ./nest_bundle.zip).')
+        # show call statistics
+        parser_stats = subparsers.add_parser('stats', help='Show call statistics of modules.')
+        parser_stats.add_argument('path', metavar='PATH', nargs='?', default=None, 
+            help='Path to the statistics file (default: <user_home>/.nest/stats.json).')
+        parser_stats.add_argument('-f', '--filter', help='Keyword for filtering module list.')
+        parser_stats.add_argument('-s', '--sort', default='total', 
+            choices=['calls', 'total', 'mean', 'p99', 'merge', 'check_params', 'check_returns'], 
+            help='Sort by the given column (default: total).')
         # check modules
         parser_check = subparsers.add_parser('check', help='Check modules.')
         parser_check.add_argument('src', metavar='SRC', nargs='*',
             help='Path to the namespaces or python files (check all available modules if not specified).')
+        parser_check.add_argument('-j', '--jobs', type=int, default=None, 
+            help='Number of files checked concurrently (default: number of CPUs).')
+        parser_check.add_argument('-t', '--timeout', type=float, default=60.0, 
+            help='Timeout of each file in seconds (default: 60).')
+        parser_check.add_argument('-o', '--output', default=None, help='Save the report to a JSON file.')
+        parser_check.add_argument('-p', '--profile', action='store_true', 
+            help='Show import time, CPU time and memory usage of each file.')
         args = parser.parse_args(arguments)
         
         if args.command == 'list':
@@ -178,7 +236,12 @@ class CLI(object):
                     '"nest module install github@ZhouYanzhao/Nest:pytorch".')
 
         elif args.command == 'install':
-            if os.path.isdir(args.src):
+            if os.path.isfile(args.src) and args.src.endswith('.zip') and module_manager._is_bundle(args.src):
+                # install Nest modules from bundle
+                confirm = 'y' if args.yes else input('Install bundle "%s" -> Search paths. Continue? (Y/n)' % (args.src,)).lower()
+                if confirm == '' or confirm == 'y':
+                    module_manager._install_namespaces_from_bundle(args.src)
+            elif os.path.isdir(args.src):
                 # install Nest modules from path
                 confirm = 'y' if args.yes else input('Install "%s" -> Search paths. Continue? (Y/n)' % (args.src,)).lower()
                 if confirm == '' or confirm == 'y':
@@ -211,28 +274,80 @@ class CLI(object):
             # pack Nest modules to a zip file
             confirm = 'y' if args.yes else input('Pack "%s" --> "%s". Continue? (Y/n)' % (','.join(args.path), args.save)).lower()
             if confirm == '' or confirm == 'y':
-                save_list = module_manager._pack_namespaces(args.path, args.save)
+                save_list = module_manager._pack_namespaces(args.path, args.save, args.jobs)
                 logger.info('Packed list: \n%s', U.indent_text(U.yaml_format(save_list), 4))
 
+        elif args.command == 'stats':
+            # show call statistics recorded by "nest task run"
+            import json
+            path = args.path or settings['CALL_STATS_PATH']
+            if not os.path.exists(path):
+                logger.info('No call statistics found. Set "PROFILE_CALLS" to true or NEST_PROFILE_CALLS=1 to record them.')
+                return
+            with open(path, 'r') as f:
+                stats = json.load(f)
+            if args.filter:
+                stats = {k: v for k, v in stats.items() if args.filter in k}
+            columns = ['calls', 'total', 'mean', 'p99', 'merge', 'check_params', 'check_returns']
+            rows = ['%-32s' % 'module' + ''.join(['%14s' % v for v in columns])]
+            for k, v in sorted(stats.items(), key=lambda x: x[1][args.sort], reverse=True):
+                rows.append('%-32s' % k + '%14d' % v['calls'] + ''.join(['%14.6f' % v[c] for c in columns[1:]]))
+            logger.info('Call statistics (seconds) of %d Nest modules:\n' % len(stats) + '\n'.join(rows))
+
+        elif args.command == 'bundle':
+            # build a bundle of precompiled namespaces
+            save_list = module_manager._bundle_namespaces(args.src, args.save)
+            logger.info('Bundled list: \n%s', U.indent_text(U.yaml_format(save_list), 4))
+
         elif args.command == 'check':
             if len(args.src) == 0:
                 logger.info('Checking all available modules')
-                # check all
-                module_manager._update_modules()
-            else:
-                for idx, path in enumerate(args.src):
-                    logger.info('[%d/%d] Checking "%s"' % (idx + 1, len(args.src), path))
-                    if os.path.isfile(path):
-                        module_manager._import_nest_modules_from_file(path, 'nest_check', dict(), dict())
-                    elif os.path.isdir(path):
-                        module_manager._import_nest_modules_from_dir(path, 'nest_check', dict(), dict())
-                    else:
-                        logger.warning('Skipped as it does not exist.')
-            logger.info('Done.')
+            tasks = module_manager._find_check_tasks(args.src)
+            counter = [0]
+            # helper function
+            def report(result):
+                counter[0] += 1
+                logger.info('[%d/%d] %s "%s" (%s, %d modules)' % (counter[0], len(tasks), result['status'].upper(), 
+                    result['path'], '-' if result['time'] is None else '%.2fs' % result['time'], len(result['modules'])))
+                for v in result['errors']:
+                    logger.info(U.indent_text(v, 4))
+            results = module_manager._check_files(tasks, args.jobs, args.timeout, report)
+            if args.output:
+                import json
+                with open(args.output, 'w') as f:
+                    json.dump(results, f, indent=2)
+            if args.profile:
+                # sorted by import time
+                rows = ['%10s %10s %12s %8s  %s' % ('wall (s)', 'cpu (s)', 'memory (MB)', 'modules', 'file')]
+                for v in sorted(results, key=lambda x: x['time'] or float('inf'), reverse=True):
+                    rows.append('%10s %10s %12s %8d  %s' % (
+                        '-' if v['time'] is None else '%.3f' % v['time'],
+                        '-' if v['cpu'] is None else '%.3f' % v['cpu'],
+                        '-' if v['memory'] is None else '%.1f' % (v['memory'] / 1024.0 / 1024.0),
+                        len(v['modules']), v['path']))
+                logger.info('Import profile:\n' + '\n'.join(rows))
+            num_failed = len([v for v in results if v['status'] != 'ok'])
+            logger.info('Done. %d files checked, %d failed.' % (len(results), num_failed))
 
         else:
             parser.print_help()
 
+    def cmd_serve(self, prog: str, arguments: str) -> None:
+        """serve          Keep Nest modules warm in a daemon.
+        """
+
+        from nest.daemon import serve
+
+        parser = Parser(prog=prog)
+        parser.add_argument('-s', '--socket', default=None, 
+            help='Path to the Unix socket (default: <user_home>/.nest/nest.sock).')
+        args = parser.parse_args(arguments)
+
+        # exception formatter
+        self.hook_exceptions(logger)
+
+        serve(args.socket)
+
     def cmd_setting(self, prog: str, arguments: str) -> None:
         """setting        Settings configuration.
         """
@@ -0,0 +1,187 @@
+import os
+import sys
+import json
+import socket
+import logging
+import contextlib
+import socketserver
+from typing import List, Optional
+
+from nest.settings import settings
+
+
+# commands that could be executed by the daemon
+FORWARD_COMMANDS = [('task', 'run'), ('module', 'list'), ('module', 'check')]
+
+
+def connect(path: Optional[str] = None) -> Optional[socket.socket]:
+    """Connect to the daemon.
+
+    Parameters:
+        path:
+            The socket path (default: settings['DAEMON_SOCKET'])
+
+    Returns:
+        The connected socket (None if the daemon is not running)
+    """
+
+    path = path or settings['DAEMON_SOCKET']
+    if not hasattr(socket, 'AF_UNIX') or not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return sock
+    except OSError:
+        sock.close()
+        return None
+
+
+class RemoteStream(object):
+    """File-like object that forwards outputs to the client.
+    """
+
+    def __init__(self, wfile: object, name: str) -> None:
+        self.wfile = wfile
+        self.name = name
+
+    def write(self, text: str) -> int:
+        try:
+            self.wfile.write((json.dumps({self.name: text}) + '\n').encode('utf8'))
+            self.wfile.flush()
+        except OSError:
+            # the client is gone
+            pass
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Execute a forwarded command in the daemon process.
+    """
+
+    def handle(self) -> None:
+        from nest.cli import CLI
+        from nest.logger import logger
+        from nest.modules import module_manager
+
+        request = json.loads(self.rfile.readline().decode('utf8'))
+        stdout = RemoteStream(self.wfile, 'out')
+        stderr = RemoteStream(self.wfile, 'err')
+        # the "main" namespace is bound to the current path of the client
+        if request['cwd'] != self.server.client_cwd:
+            module_manager._unload_namespace('main')
+            self.server.client_cwd = request['cwd']
+        screen_handlers = [v for v in logger.handlers if type(v) is logging.StreamHandler]
+        streams = [v.stream for v in screen_handlers]
+        environ, argv, cwd = dict(os.environ), sys.argv, os.path.abspath(os.curdir)
+        code = 0
+        try:
+            os.chdir(request['cwd'])
+            os.environ.clear()
+            os.environ.update(request['env'])
+            # settings may be changed by commands that are not forwarded (e.g., "nest module install")
+            if settings.refresh():
+                namespaces = set(module_manager.namespaces.keys())
+                module_manager._update_namespaces(force=True)
+                for namespace in namespaces - set(module_manager.namespaces.keys()):
+                    module_manager._unload_namespace(namespace)
+                module_manager.update_timestamp = 0.0
+            sys.argv = ['nest'] + request['argv']
+            for v in screen_handlers:
+                v.stream = stderr
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    CLI()
+                except SystemExit as exc_info:
+                    code = exc_info.code if isinstance(exc_info.code, int) else 1
+                except Exception:
+                    sys.excepthook(*sys.exc_info())
+                    code = 1
+        finally:
+            for v, stream in zip(screen_handlers, streams):
+                v.stream = stream
+            os.environ.clear()
+            os.environ.update(environ)
+            sys.argv = argv
+            os.chdir(cwd)
+        try:
+            self.wfile.write((json.dumps(dict(exit=code)) + '\n').encode('utf8'))
+        except OSError:
+            pass
+
+
+def serve(path: Optional[str] = None) -> None:
+    """Run the daemon that keeps Nest modules warm.
+    Requests are executed one by one.
+
+    Parameters:
+        path:
+            The socket path
+    """
+
+    if not hasattr(socket, 'AF_UNIX'):
+        raise NotImplementedError('The daemon requires Unix domain sockets.')
+
+    from nest.logger import logger
+    from nest.modules import module_manager
+
+    path = path or settings['DAEMON_SOCKET']
+    sock = connect(path)
+    if sock is not None:
+        sock.close()
+        raise RuntimeError('Another daemon is listening on "%s".' % path)
+    if os.path.exists(path):
+        # remove stale socket
+        os.remove(path)
+    # warm up
+    module_manager._update_modules()
+    server = socketserver.UnixStreamServer(path, RequestHandler)
+    server.client_cwd = os.path.abspath(os.curdir)
+    logger.info('Serving %d Nest modules on "%s".' % (len(module_manager), path))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info('Daemon is stopped by user.')
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def forward(argv: List[str], path: Optional[str] = None) -> Optional[int]:
+    """Forward a command to the daemon if it is running.
+
+    Parameters:
+        argv:
+            The command line arguments
+        path:
+            The socket path (default: settings['DAEMON_SOCKET'])
+
+    Returns:
+        The exit code (None if the command is not handled by the daemon)
+    """
+
+    if tuple(argv[:2]) not in FORWARD_COMMANDS or '-h' in argv or '--help' in argv:
+        return None
+    sock = connect(path)
+    if sock is None:
+        return None
+
+    with sock, sock.makefile('rb') as rfile:
+        request = dict(argv=argv, cwd=os.path.abspath(os.curdir), env=dict(os.environ))
+        sock.sendall((json.dumps(request) + '\n').encode('utf8'))
+        for line in rfile:
+            msg = json.loads(line.decode('utf8'))
+            if 'out' in msg:
+                sys.stdout.write(msg['out'])
+                sys.stdout.flush()
+            elif 'err' in msg:
+                sys.stderr.write(msg['err'])
+                sys.stderr.flush()
+            elif 'exit' in msg:
+                return msg['exit']
+    # the daemon is terminated during execution
+    return 1
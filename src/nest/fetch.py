@@ -0,0 +1,324 @@
+import os
+import json
+import zlib
+import struct
+import shutil
+import hashlib
+import contextlib
+from typing import Optional, Callable, Iterator
+
+from nest.settings import settings
+
+
+# block size of downloading and hashing
+CHUNK_SIZE = 1 << 20
+
+
+@contextlib.contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock of a file (no-op if unsupported).
+    Processes sharing the cache wait for each other instead of fetching the same thing twice.
+
+    Parameters:
+        path:
+            Path to the lock file
+    """
+
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def get_cache_dir(name: str) -> str:
+    """Get (and create) a sub-directory of the cache.
+
+    Parameters:
+        name:
+            Name of the sub-directory
+
+    Returns:
+        Path to the sub-directory
+    """
+
+    path = os.path.join(settings['CACHE_DIR'], name)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class ZipStreamExtractor(object):
+    """Extract members of a zip file while it is being downloaded.
+    Members are parsed from their local headers, so the extraction fails (and should be redone
+    from the complete file) if sizes are deferred to data descriptors, or members are encrypted or
+    compressed by methods other than deflate.
+    Only the members in sub-directories (namespaces) are extracted.
+    """
+
+    def __init__(self, dst: str) -> None:
+        self.dst = os.path.abspath(dst)
+        self.buffer = bytearray()
+        self.member = None
+        self.names = []
+        self.done = False
+        self.failed = False
+
+    def feed(self, data: bytes) -> None:
+        """Feed the next chunk of the zip file.
+
+        Parameters:
+            data:
+                The chunk
+        """
+
+        if self.done or self.failed:
+            return
+        self.buffer += data
+        try:
+            self._process()
+        except Exception:
+            self.failed = True
+            self._close_member()
+            self.buffer = bytearray()
+
+    def close(self) -> bool:
+        """Finish the extraction.
+
+        Returns:
+            True if all members are extracted, otherwise False
+        """
+
+        if not self.done:
+            self.failed = True
+            self._close_member()
+        return not self.failed
+
+    def _process(self) -> None:
+        while True:
+            if self.member is None:
+                if len(self.buffer) < 30:
+                    if len(self.buffer) >= 4 and bytes(self.buffer[:4]) != b'PK\x03\x04':
+                        # reach the central directory
+                        self.done = True
+                    return
+                signature, _, flags, method, _, _, crc, compress_size, file_size, name_len, extra_len = \
+                    struct.unpack('<4sHHHHHIIIHH', bytes(self.buffer[:30]))
+                if signature != b'PK\x03\x04':
+                    self.done = True
+                    return
+                if len(self.buffer) < 30 + name_len + extra_len:
+                    return
+                if flags & 0x09 or method not in (0, 8) or compress_size == 0xFFFFFFFF:
+                    raise NotImplementedError('Unsupported zip member.')
+                name = bytes(self.buffer[30: 30 + name_len]).decode('utf8' if flags & 0x800 else 'cp437')
+                del self.buffer[:30 + name_len + extra_len]
+                self._open_member(name, method, crc, compress_size)
+            size = min(len(self.buffer), self.member['remaining'])
+            if size > 0:
+                self._write(bytes(self.buffer[:size]))
+                del self.buffer[:size]
+            if self.member['remaining'] > 0:
+                return
+            self._finish_member()
+
+    def _open_member(self, name: str, method: int, crc: int, compress_size: int) -> None:
+        path = None
+        if '/' in name.strip('/') and not name.endswith('/'):
+            parts = name.split('/')
+            if name.startswith('/') or '..' in parts or ':' in parts[0]:
+                raise ValueError('Unsafe member name "%s".' % name)
+            path = os.path.join(self.dst, *parts)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.names.append(name)
+        self.member = dict(
+            name=name, crc=crc, computed_crc=0, remaining=compress_size,
+            decompressor=zlib.decompressobj(-15) if method == 8 else None,
+            file=open(path, 'wb') if path is not None else None)
+
+    def _write(self, data: bytes, decompress: bool = True) -> None:
+        member = self.member
+        if decompress:
+            member['remaining'] -= len(data)
+            if member['decompressor'] is not None:
+                data = member['decompressor'].decompress(data)
+        member['computed_crc'] = zlib.crc32(data, member['computed_crc'])
+        if member['file'] is not None:
+            member['file'].write(data)
+
+    def _finish_member(self) -> None:
+        member = self.member
+        if member['decompressor'] is not None:
+            self._write(member['decompressor'].flush(), decompress=False)
+        self._close_member()
+        if member['computed_crc'] != member['crc']:
+            raise ValueError('Bad CRC-32 for member "%s".' % member['name'])
+
+    def _close_member(self) -> None:
+        if self.member is not None and self.member['file'] is not None:
+            self.member['file'].close()
+        self.member = None
+
+
+def download(
+    url: str,
+    extractor: Optional[ZipStreamExtractor] = None,
+    progress: Optional[Callable[[int, int], None]] = None) -> str:
+    """Download a file to the content-addressed cache.
+    Cached files are revalidated by ETag / Last-Modified, and used directly if the origin is unreachable.
+    Interrupted downloads are resumed with Range requests.
+    The expected sha256 could be specified by the URL fragment, e.g., "https://host/a.zip#sha256=<hex>".
+
+    Parameters:
+        url:
+            URL of the file
+        extractor:
+            Receive downloaded bytes if specified (untouched if the cached file is used)
+        progress:
+            Called with downloaded and total size (-1 if unknown) in bytes
+
+    Returns:
+        Path to the cached file
+    """
+
+    from urllib import request, error, parse
+
+    url, fragment = parse.urldefrag(url)
+    expected = dict(parse.parse_qsl(fragment)).get('sha256')
+    if expected is not None:
+        expected = expected.lower()
+    key = hashlib.sha256(url.encode('utf8')).hexdigest()
+    blob_dir, url_dir = get_cache_dir('blobs'), get_cache_dir('urls')
+    index_path = os.path.join(url_dir, key + '.json')
+    part_path = os.path.join(url_dir, key + '.part')
+    blob_path = lambda digest: os.path.join(blob_dir, digest)
+
+    with file_lock(os.path.join(url_dir, key + '.lock')):
+        # check the cache
+        response = None
+        index = None
+        if os.path.exists(index_path):
+            with open(index_path, 'r') as f:
+                index = json.load(f)
+        if expected is not None and os.path.exists(blob_path(expected)):
+            # content addressed
+            return blob_path(expected)
+        if index is not None and os.path.exists(blob_path(index['sha256'])) and \
+            os.path.getsize(blob_path(index['sha256'])) == index['size'] and expected in (None, index['sha256']):
+            headers = dict()
+            if index.get('etag'):
+                headers['If-None-Match'] = index['etag']
+            if index.get('last_modified'):
+                headers['If-Modified-Since'] = index['last_modified']
+            try:
+                response = request.urlopen(request.Request(url, headers=headers))
+            except error.HTTPError as exc_info:
+                if exc_info.code == 304:
+                    return blob_path(index['sha256'])
+                raise
+            except error.URLError:
+                # the origin is unreachable
+                return blob_path(index['sha256'])
+
+        # resume the partial download
+        offset = 0
+        part_meta_path = part_path + '.json'
+        if response is None and os.path.exists(part_path) and os.path.exists(part_meta_path):
+            with open(part_meta_path, 'r') as f:
+                part_meta = json.load(f)
+            offset = os.path.getsize(part_path)
+            headers = {'Range': 'bytes=%d-' % offset}
+            if part_meta.get('etag'):
+                headers['If-Range'] = part_meta['etag']
+            response = request.urlopen(request.Request(url, headers=headers))
+        elif response is None:
+            response = request.urlopen(url)
+        if response.status != 206:
+            offset = 0
+
+        with response:
+            length = int(response.headers.get('Content-Length', -1))
+            total = offset + length if length >= 0 else -1
+            with open(part_meta_path, 'w') as f:
+                json.dump(dict(etag=response.headers.get('ETag')), f)
+            sha = hashlib.sha256()
+            with open(part_path, 'r+b' if offset > 0 else 'wb') as f:
+                # replay the downloaded bytes
+                while f.tell() < offset:
+                    chunk = f.read(min(CHUNK_SIZE, offset - f.tell()))
+                    sha.update(chunk)
+                    if extractor is not None:
+                        extractor.feed(chunk)
+                size = offset
+                for chunk in iter(lambda: response.read(CHUNK_SIZE), b''):
+                    f.write(chunk)
+                    sha.update(chunk)
+                    if extractor is not None:
+                        extractor.feed(chunk)
+                    size += len(chunk)
+                    if progress is not None:
+                        progress(size, total)
+
+        # verify
+        if total >= 0 and size != total:
+            raise IOError('Incomplete download of "%s" (%d / %d bytes).' % (url, size, total))
+        digest = sha.hexdigest()
+        if expected is not None and digest != expected:
+            os.remove(part_path)
+            raise IOError('Integrity check failed for "%s". Expected sha256 "%s", got "%s".' % (url, expected, digest))
+        os.replace(part_path, blob_path(digest))
+        os.remove(part_meta_path)
+        with open(index_path, 'w') as f:
+            json.dump(dict(url=url, etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'), sha256=digest, size=size), f)
+
+    return blob_path(digest)
+
+
+def clone(url: str, dst: str, branch: Optional[str] = None, depth: Optional[int] = None) -> None:
+    """Clone a git repo through the per-user bare mirror cache.
+    The mirror is fetched incrementally (or used as is if the origin is unreachable),
+    and the repo is cloned from it locally, so repeated installs and branch switches skip the transfer.
+
+    Parameters:
+        url:
+            URL of the git repo
+        dst:
+            Path to the cloned repo
+        branch:
+            The branch to check out (default: the default branch)
+        depth:
+            Clone with the given depth (default: settings['GIT_CLONE_DEPTH'])
+    """
+
+    import subprocess
+    from nest.logger import logger
+
+    depth = depth or settings['GIT_CLONE_DEPTH']
+    mirror_path = os.path.join(get_cache_dir('git'), hashlib.sha256(url.encode('utf8')).hexdigest() + '.git')
+    with file_lock(mirror_path + '.lock'):
+        if os.path.isdir(mirror_path):
+            try:
+                subprocess.check_call(['git', '-C', mirror_path, 'remote', 'update', '--prune'])
+            except subprocess.CalledProcessError:
+                logger.warning('Could not update the mirror of "%s". The cached one is used.' % url)
+        else:
+            tmp_path = mirror_path + '.tmp'
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            subprocess.check_call(['git', 'clone', '--mirror', url, tmp_path])
+            os.replace(tmp_path, mirror_path)
+        # local clones hardlink objects, while shallow clones require the file protocol
+        cmd = ['git', 'clone']
+        if branch is not None:
+            cmd += ['-b', branch]
+        if depth:
+            cmd += ['--depth', str(depth), 'file://' + mirror_path]
+        else:
+            cmd += [mirror_path]
+        subprocess.check_call(cmd + [dst])
+    subprocess.check_call(['git', '-C', dst, 'remote', 'set-url', 'origin', url])
@@ -1,7 +1,11 @@
 import os
 import sys
+import json
+import queue
 import logging
 import warnings
+import contextvars
+import logging.handlers
 from typing import Callable
 
 from nest.settings import settings
@@ -15,8 +19,129 @@ class ExceptionFilter(logging.Filter):
         return record.levelno != logging.ERROR
 
 
+# tags of log records (set by the task runner and Nest modules if async logging is enabled)
+trial_context = contextvars.ContextVar('nest_trial', default=None)
+module_context = contextvars.ContextVar('nest_module', default=None)
+_async_logging = None
+
+
+def is_async_logging() -> bool:
+    """Whether log records are written to file in a background thread.
+    """
+
+    global _async_logging
+    if _async_logging is None:
+        _async_logging = bool(settings['LOGGING_TO_FILE'] and settings['LOGGING_ASYNC'])
+    return _async_logging
+
+
+class ContextFilter(logging.Filter):
+    """Tag records with the trial index and the Nest module id.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trial = trial_context.get()
+        record.module_id = module_context.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as JSON lines.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = dict(time=self.formatTime(record), level=record.levelname, message=record.getMessage(),
+            trial=getattr(record, 'trial', None), module=getattr(record, 'module_id', None),
+            process=record.process, thread=record.threadName)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that keeps exceptions and tags for the JSON formatter.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SettingsFileHandler(logging.Handler):
+    """File handler that is configured by Nest settings on first use.
+    With "LOGGING_ASYNC", records are passed through a queue and written as JSON lines by a background thread.
+    """
+
+    def __init__(self, level: int = logging.NOTSET) -> None:
+        super(SettingsFileHandler, self).__init__(level)
+        self.handler = None
+        self.listener = None
+        self.file_level = logging.NOTSET
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        # the background thread is not inherited by forked processes
+        if self.listener is not None:
+            self.handler = None
+            self.listener = None
+
+    def _create_handler(self) -> logging.Handler:
+        if not settings['LOGGING_TO_FILE']:
+            return logging.NullHandler()
+        self.file_level = logging.getLevelName(str(settings['LOGGING_LEVEL']).upper())
+        if not isinstance(self.file_level, int):
+            raise ValueError('Invalid logging level "%s".' % settings['LOGGING_LEVEL'])
+        if settings['LOGGING_MAX_BYTES']:
+            file_handler = logging.handlers.RotatingFileHandler(settings['LOGGING_PATH'], encoding='utf8',
+                maxBytes=settings['LOGGING_MAX_BYTES'], backupCount=settings['LOGGING_BACKUP_COUNT'])
+        else:
+            file_handler = logging.FileHandler(settings['LOGGING_PATH'], encoding='utf8')
+        if not is_async_logging():
+            file_handler.setFormatter(self.formatter)
+            return file_handler
+        file_handler.setFormatter(JsonFormatter())
+        records = queue.SimpleQueue()
+        self.listener = logging.handlers.QueueListener(records, file_handler)
+        self.listener.start()
+        queue_handler = QueueHandler(records)
+        queue_handler.addFilter(ContextFilter())
+        return queue_handler
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.handler is None:
+            self.handler = self._create_handler()
+        if record.levelno >= self.file_level:
+            self.handler.handle(record)
+
+    def flush(self) -> None:
+        if self.listener is not None:
+            # wait for queued records
+            self.listener.stop()
+            self.listener.start()
+        if self.handler is not None:
+            self.handler.flush()
+
+    def close(self) -> None:
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener.handlers[0].close()
+            self.listener = None
+        if self.handler is not None:
+            self.handler.close()
+        super(SettingsFileHandler, self).close()
+
+
 def setup_logger() -> logging.RootLogger:
     """Initialize logger.
+    The log file is opened when the first record is written to it.
 
     Returns:
         The global logger
@@ -33,13 +158,11 @@ def setup_logger() -> logging.RootLogger:
     screen_handler.setFormatter(screen_formatter)
     screen_handler.addFilter(ExceptionFilter())
     logger.addHandler(screen_handler)
-    if settings['LOGGING_TO_FILE']:
-        # create a file handler which logs warning and error messages
-        file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler = logging.FileHandler(settings['LOGGING_PATH'], encoding='utf8')
-        file_handler.setLevel(logging.WARNING)
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+    # create a file handler which logs messages above settings['LOGGING_LEVEL']
+    file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = SettingsFileHandler()
+    file_handler.setFormatter(file_formatter)
+    logger.addHandler(file_handler)
 
     return logger
 
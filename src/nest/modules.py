@@ -1,26 +1,39 @@
 import os
 import re
 import sys
+import time
 import fnmatch
 import inspect
 import importlib
-import importlib.abc
 import importlib.util
 import importlib.machinery
+import json
+import marshal
+import collections.abc
 import warnings
 import subprocess
 from types import ModuleType
-from typing import Any, List, Dict, Iterator, Callable, Optional
+from typing import Any, List, Dict, Tuple, Iterable, Iterator, Callable, Awaitable, Optional, TypeVar
 from difflib import SequenceMatcher
 from datetime import datetime
 from argparse import Namespace as BaseNamespace
 from inspect import formatannotation as format_anno
 
 from nest import utils as U
-from nest.logger import exception
+from nest.logger import exception, is_async_logging, module_context
 from nest.settings import settings
 
 
+# manifest of pre-built namespace bundles
+BUNDLE_MANIFEST = 'nest_bundle.json'
+# manifest of packed namespaces
+PACK_MANIFEST = 'nest_pack.json'
+# prefix of the result line printed by module checking subprocesses
+CHECK_RESULT_PREFIX = '__nest_check__'
+# tools allowed to install requirements of namespaces
+INSTALL_TOOLS = ('pip', 'conda')
+
+
 class Context(BaseNamespace):
     """Helper class for storing module context.
     """
@@ -105,35 +118,73 @@ class NestModule(object):
             raise TypeError('Unexpected param(s) "%s" for Nest module: \n%s' % \
                 (unexpected_params, self))
 
-        for k, v in self.sig.parameters.items():
-            resolved = params.get(k)
-            if resolved is None:
-                if v.default is inspect.Parameter.empty:
-                    raise KeyError('The required param "%s" of Nest module "%s" is missing.' % \
-                        (v, self.__name__))
-            elif not U.is_annotation_matched(resolved, v.annotation):
-                if issubclass(type(resolved), NestModule):
-                    detailed_msg = 'The param "%s" of Nest module "%s" should be type of "%s". Got \n%s\n' + \
-                    'Please check if some important params of Nest module "%s" have been forgotten in use.'
-                    raise TypeError(detailed_msg % \
-                        (k, self.__name__, format_anno(v.annotation), U.indent_text(str(resolved), 4), resolved.__name__))
-                else:
-                    raise TypeError('The param "%s" of Nest module "%s" should be type of "%s". Got "%s".' % \
-                        (k, self.__name__, format_anno(v.annotation), resolved))
+        for k in self.sig.parameters.keys():
+            self._check_param(k, params.get(k))
+
+    def _check_param(self, key: str, resolved: Any) -> None:
+        """Raise errors if an invalid param is provided to the Nest module.
+
+        Parameters:
+            key:
+                The param name
+            resolved:
+                The provided value (None if not provided)
+        """
+
+        v = self.sig.parameters[key]
+        if resolved is None:
+            if v.default is inspect.Parameter.empty:
+                raise KeyError('The required param "%s" of Nest module "%s" is missing.' % \
+                    (v, self.__name__))
+        elif not U.is_annotation_matched(resolved, v.annotation):
+            if issubclass(type(resolved), NestModule):
+                detailed_msg = 'The param "%s" of Nest module "%s" should be type of "%s". Got \n%s\n' + \
+                'Please check if some important params of Nest module "%s" have been forgotten in use.'
+                raise TypeError(detailed_msg % \
+                    (key, self.__name__, format_anno(v.annotation), U.indent_text(str(resolved), 4), resolved.__name__))
+            else:
+                raise TypeError('The param "%s" of Nest module "%s" should be type of "%s". Got "%s".' % \
+                    (key, self.__name__, format_anno(v.annotation), resolved))
 
-    def _check_returns(self, returns: Any) -> None:
+    def _check_returns(self, returns: Any) -> Any:
         """Raise errors if invalid returns are generated by the Nest module.
+        Iterator / generator returns are wrapped so that their items are checked as they are consumed.
 
         Parameters:
             returns: 
                 The generated returns
+
+        Returns:
+            The checked returns
         """
 
-        if not U.is_annotation_matched(returns, self.sig.return_annotation):
+        annotation = self.sig.return_annotation
+        if not U.is_annotation_matched(returns, annotation):
             raise TypeError('The returns of Nest module "%s" should be type of "%s". Got "%s".' % \
-                (self.__name__, format_anno(self.sig.return_annotation), returns))
+                (self.__name__, format_anno(annotation), returns))
+
+        if str(annotation).split('[')[0] in ('typing.Iterable', 'typing.Iterator', 'typing.Generator'):
+            item_annotation = (getattr(annotation, '__args__', None) or [TypeVar('T')])[0]
+            every = settings['RETURNS_CHECK_EVERY']
+            if isinstance(item_annotation, TypeVar) or not every:
+                return returns
+            if isinstance(returns, collections.abc.Generator):
+                return CheckedGenerator(returns, item_annotation, self.__name__, every)
+            elif isinstance(returns, collections.abc.Iterator):
+                proxy = SizedCheckedIterator if isinstance(returns, collections.abc.Sized) else CheckedIterator
+                return proxy(returns, item_annotation, self.__name__, every)
+            elif isinstance(returns, (list, tuple, set)):
+                # already materialized
+                for idx, item in enumerate(returns):
+                    if idx % every == 0 and not U.is_annotation_matched(item, item_annotation):
+                        raise TypeError('The item #%d of the returns of Nest module "%s" should be type of "%s". Got "%s".' % \
+                            (idx, self.__name__, format_anno(item_annotation), item))
+        return returns
 
     def __call__(self, *args, **kwargs):
+        profiler = call_profiler if call_profiler.is_enabled() else None
+        if profiler is not None:
+            start_time = time.perf_counter()
         # handle positional params
         num_args = len(args)
         if num_args > 0:
@@ -156,10 +207,22 @@ class NestModule(object):
         U.merge_dict(resolved_params, self.params, union=True)
         U.merge_dict(resolved_params, kwargs, union=True)
 
+        is_async = self.is_async
+        if profiler is None:
+            check_params, func, check_returns = self._check_params, self.func, self._check_returns
+        else:
+            profiler.record(self, 'merge', time.perf_counter() - start_time)
+            check_params = profiler.wrap(self, 'check_params', self._check_params)
+            # the call of async modules is timed when awaited
+            func = self.func if is_async else profiler.wrap(self, 'call', self.func)
+            check_returns = profiler.wrap(self, 'check_returns', self._check_returns)
+        if is_async_logging() and not is_async:
+            func = self._tag_logs(func)
+
         if resolved_params.pop('delay_resolve', None):
             try:
-                self._check_params(resolved_params)
-                returns = self.func(**resolved_params)
+                check_params(resolved_params)
+                returns = func(**resolved_params)
             except KeyError as exc_info:
                 if 'Nest module' in str(exc_info):
                     # wait for next call
@@ -168,18 +231,79 @@ class NestModule(object):
                     raise
         else:
             # parameters must be fulfilled
-            self._check_params(resolved_params)
-            returns = self.func(**resolved_params)
+            check_params(resolved_params)
+            returns = func(**resolved_params)
+        if is_async:
+            # returns are checked once awaited
+            return self._await_returns(returns, check_returns, profiler)
         # check returns
-        self._check_returns(returns)
-        return returns
+        return check_returns(returns)
+
+    async def _await_returns(self, coroutine: Awaitable, check_returns: Callable, profiler: Optional['CallProfiler'] = None) -> Any:
+        """Await the coroutine of an async Nest module and check its returns.
+
+        Parameters:
+            coroutine:
+                The coroutine returned by the module function
+            check_returns:
+                The function to check returns
+            profiler:
+                Record the time of the call if specified
+
+        Returns:
+            The awaited returns
+        """
+
+        token = module_context.set(self.module_id) if is_async_logging() else None
+        try:
+            start_time = time.perf_counter()
+            returns = await coroutine
+            if profiler is not None:
+                profiler.record(self, 'call', time.perf_counter() - start_time)
+        finally:
+            if token is not None:
+                module_context.reset(token)
+        return check_returns(returns)
+
+    def _tag_logs(self, func: Callable) -> Callable:
+        """Wrap the module function so that its log records are tagged with the module id.
+        """
+
+        module_id = self.module_id
+
+        def wrapper(*args, **kwargs):
+            token = module_context.set(module_id)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                module_context.reset(token)
+
+        return wrapper
+
+    @property
+    def is_async(self) -> bool:
+        """Whether the Nest module is defined by an async function.
+        """
+
+        return inspect.iscoroutinefunction(self.func)
+
+    @property
+    def module_id(self) -> str:
+        """Unique id of the Nest module (the name if it is not imported from a namespace).
+        """
+
+        py_module_name = getattr(self.func, '__module__', None) or ''
+        if py_module_name.startswith('nest.') and py_module_name.count('.') == 2:
+            return U.encode_id(py_module_name.split('.')[1], self.__name__)
+        else:
+            return self.__name__
 
     def __str__(self) -> str:
         param_string = ', \n'.join(['[✓] ' + str(v) 
             if k in self.params.keys() else '    ' + str(v)
             for k, v in self.sig.parameters.items()])
         return_string = ' -> ' + format_anno(self.sig.return_annotation)
-        return self.__name__ + '(\n' + param_string + ')' + return_string
+        return ('async ' if self.is_async else '') + self.__name__ + '(\n' + param_string + ')' + return_string
 
     def __repr__(self) -> str:
         return "nest.modules['%s']" % self.__name__
@@ -194,21 +318,434 @@ class NestModule(object):
 
         return type(self)(self.func, self.meta, params)
 
+    def __reduce__(self) -> tuple:
+        # picklable for process executors (the module func is shadowed by the Nest module itself)
+        return (_load_nest_module, (self.func.__module__, self.func.__qualname__, self.params))
+
+    def _apply(self, key: str, params: dict, items: List[Any]) -> List[Any]:
+        """Call the Nest module on a chunk of items with validated bound params.
+
+        Parameters:
+            key:
+                The name of the param that varies with items
+            params:
+                The validated bound params
+            items:
+                The chunk of items
+
+        Returns:
+            The results
+        """
+
+        results = []
+        for val in items:
+            self._check_param(key, val)
+            returns = self.func(**params, **{key: val})
+            results.append(self._check_returns(returns))
+        return results
+
+    def imap(
+        self, 
+        iterable: Iterable, 
+        executor: Optional[str] = 'thread', 
+        workers: Optional[int] = None, 
+        chunksize: int = 1, 
+        ordered: bool = True, 
+        **kwargs) -> Iterator:
+        """Lazily apply the Nest module to each item of an iterable.
+        Bound params are validated once, while items are passed as the only unresolved param.
+        At most 2 x workers chunks are in flight, so the memory stays bounded.
+
+        Parameters:
+            iterable:
+                The items
+            executor:
+                "thread", "process", or None (in the current thread)
+            workers:
+                Max number of workers (default: number of CPUs)
+            chunksize:
+                Number of items per task
+            ordered:
+                Yield results in the order of items if set to true, otherwise as soon as they are ready
+            kwargs:
+                Bound params
+
+        Returns:
+            The iterator of results
+        """
+
+        if self.is_async:
+            raise TypeError('Async Nest module "%s" could not be mapped.' % self.__name__)
+        if executor not in (None, 'thread', 'process'):
+            raise ValueError('Unknown executor "%s". Expected "thread", "process", or None.' % executor)
+        if chunksize < 1:
+            raise ValueError('The chunksize should be a positive integer. Got "%s".' % chunksize)
+
+        # validate bound params once
+        resolved_params = dict()
+        U.merge_dict(resolved_params, self.params, union=True)
+        U.merge_dict(resolved_params, kwargs, union=True)
+        unexpected_params = ', '.join(set(resolved_params.keys()) - set(self.sig.parameters.keys()))
+        if len(unexpected_params) > 0:
+            raise TypeError('Unexpected param(s) "%s" for Nest module: \n%s' % (unexpected_params, self))
+        expected_param_names = [k for k, v in self.sig.parameters.items()
+                                if not k in resolved_params.keys() and v.default is inspect.Parameter.empty]
+        if len(expected_param_names) != 1:
+            raise TypeError('Nest module "%s" should have exactly one unresolved param to be mapped. Got "%s".' %
+                            (self.__name__, ', '.join(expected_param_names)))
+        key = expected_param_names[0]
+        for k in self.sig.parameters.keys():
+            if k != key:
+                self._check_param(k, resolved_params.get(k))
+
+        return self._imap(key, resolved_params, iterable, executor, workers or os.cpu_count() or 1, chunksize, ordered)
+
+    def _imap(self, key: str, params: dict, iterable: Iterable, executor: Optional[str], 
+        workers: int, chunksize: int, ordered: bool) -> Iterator:
+        import itertools
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+        iterator = iter(iterable)
+        chunks = iter(lambda: list(itertools.islice(iterator, chunksize)), [])
+        if executor is None:
+            for chunk in chunks:
+                yield from self._apply(key, params, chunk)
+            return
+
+        pool_class = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+        pending = deque() if ordered else set()
+        # spawned workers import the registry of this process without discovery
+        pool_kwargs = dict() if executor == 'thread' else dict(initializer=init_worker, initargs=(module_manager._snapshot(),))
+        with pool_class(max_workers=workers, **pool_kwargs) as pool:
+            try:
+                for chunk in chunks:
+                    future = pool.submit(self._apply, key, params, chunk)
+                    if ordered:
+                        pending.append(future)
+                        if len(pending) >= 2 * workers:
+                            yield from pending.popleft().result()
+                    else:
+                        pending.add(future)
+                        if len(pending) >= 2 * workers:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                yield from future.result()
+                while len(pending) > 0:
+                    if ordered:
+                        yield from pending.popleft().result()
+                    else:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield from future.result()
+            finally:
+                # the consumer may stop early
+                for future in pending:
+                    future.cancel()
+
+    def map(
+        self, 
+        iterable: Iterable, 
+        executor: Optional[str] = 'thread', 
+        workers: Optional[int] = None, 
+        chunksize: int = 1, 
+        ordered: bool = True, 
+        **kwargs) -> List[Any]:
+        """Apply the Nest module to each item of an iterable.
+        See "imap" for details of the parameters.
+
+        Returns:
+            The list of results
+        """
+
+        return list(self.imap(iterable, executor, workers, chunksize, ordered, **kwargs))
+
+
+class CheckedIterator(object):
+    """Iterator proxy that checks items of the returns of a Nest module as they are consumed.
+    Other attributes are forwarded to the wrapped iterator.
+    """
+
+    __slots__ = ('iterator', 'annotation', 'module_name', 'every', 'count')
+
+    def __init__(self, iterator: Iterator, annotation: object, module_name: str, every: int = 1) -> None:
+        self.iterator = iterator
+        self.annotation = annotation
+        self.module_name = module_name
+        # check every k-th item
+        self.every = every
+        self.count = 0
+
+    def _check(self, item: Any) -> Any:
+        idx = self.count
+        self.count += 1
+        if idx % self.every == 0 and not U.is_annotation_matched(item, self.annotation):
+            raise TypeError('The item #%d of the returns of Nest module "%s" should be type of "%s". Got "%s".' % \
+                (idx, self.module_name, format_anno(self.annotation), item))
+        return item
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self) -> Any:
+        return self._check(next(self.iterator))
+
+    def __getattr__(self, name: str) -> Any:
+        if name in CheckedIterator.__slots__:
+            # not initialized (e.g., being copied)
+            raise AttributeError(name)
+        return getattr(self.iterator, name)
+
+    def __repr__(self) -> str:
+        return repr(self.iterator)
+
+
+class SizedCheckedIterator(CheckedIterator):
+    """Iterator proxy for iterators with length.
+    """
+
+    __slots__ = ()
+
+    def __len__(self) -> int:
+        return len(self.iterator)
+
+
+class CheckedGenerator(CheckedIterator):
+    """Generator proxy that checks yielded items of the returns of a Nest module.
+    """
+
+    __slots__ = ()
+
+    def send(self, value: Any) -> Any:
+        return self._check(self.iterator.send(value))
+
+    def throw(self, *args) -> Any:
+        return self._check(self.iterator.throw(*args))
+
+    def close(self) -> None:
+        self.iterator.close()
+
+
+def init_worker(snapshot: Dict[str, Any]) -> None:
+    """Initializer of worker processes, e.g., 
+    ProcessPoolExecutor(initializer=init_worker, initargs=(module_manager._snapshot(),)).
+    Spawned workers import the Nest modules in the snapshot without discovery, 
+    while forked workers keep the inherited registry.
+
+    Parameters:
+        snapshot:
+            The snapshot of the registry of the parent process
+    """
+
+    if len(module_manager.py_modules) == 0:
+        module_manager._load_snapshot(snapshot)
+
+
+def _load_nest_module(py_module_name: str, qualname: str, params: dict) -> NestModule:
+    """Load a pickled Nest module by reference.
+    """
+
+    nest_module = importlib.import_module(py_module_name)
+    for name in qualname.split('.'):
+        nest_module = getattr(nest_module, name)
+    if not isinstance(nest_module, NestModule):
+        raise TypeError('Could not load Nest module "%s" from "%s".' % (qualname, py_module_name))
+    return nest_module.clone(params)
+
+
+class CallProfiler(object):
+    """Collect call statistics of Nest modules.
+    """
+
+    # max number of recorded durations per module for computing percentiles
+    max_records = 10000
+
+    def __init__(self) -> None:
+        self.enabled = None
+        self.stats = dict()
+        self.module_ids = dict()
+
+    def is_enabled(self) -> bool:
+        """Whether the profiler is enabled by the env var "NEST_PROFILE_CALLS" or the settings.
+        """
+
+        if self.enabled is None:
+            env = os.environ.get('NEST_PROFILE_CALLS')
+            self.enabled = env.lower() in ('1', 'true', 'yes') if env is not None else bool(settings['PROFILE_CALLS'])
+        return self.enabled
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+
+    def get_module_id(self, module: NestModule) -> str:
+        """Get the (cached) unique id of a Nest module.
+        """
+
+        module_id = self.module_ids.get(module.func)
+        if module_id is None:
+            module_id = module.module_id
+            self.module_ids[module.func] = module_id
+        return module_id
+
+    def record(self, module: NestModule, key: str, elapsed: float) -> None:
+        """Record elapsed time of a stage.
+
+        Parameters:
+            module:
+                The Nest module
+            key:
+                The stage, i.e., "merge", "check_params", "call", or "check_returns"
+            elapsed:
+                Elapsed time in seconds
+        """
+
+        module_id = self.get_module_id(module)
+        stats = self.stats.get(module_id)
+        if stats is None:
+            stats = dict(calls=0, merge=0.0, check_params=0.0, call=0.0, check_returns=0.0, durations=[])
+            self.stats[module_id] = stats
+        stats[key] += elapsed
+        if key == 'call':
+            stats['calls'] += 1
+            durations = stats['durations']
+            if len(durations) < self.max_records:
+                durations.append(elapsed)
+            else:
+                durations[stats['calls'] % self.max_records] = elapsed
+
+    def wrap(self, module: NestModule, key: str, func: Callable) -> Callable:
+        """Wrap a function to record its elapsed time.
+        """
+
+        def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(module, key, time.perf_counter() - start_time)
+
+        return wrapper
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Summarize the call statistics.
+
+        Returns:
+            Statistics of each Nest module
+        """
+
+        summary = dict()
+        for module_id, stats in self.stats.items():
+            durations = sorted(stats['durations'])
+            summary[module_id] = dict(
+                calls=stats['calls'],
+                total=stats['call'],
+                mean=stats['call'] / stats['calls'] if stats['calls'] > 0 else 0.0,
+                p99=durations[min(len(durations) - 1, int(len(durations) * 0.99))] if len(durations) > 0 else 0.0,
+                merge=stats['merge'],
+                check_params=stats['check_params'],
+                check_returns=stats['check_returns'])
+        return summary
+
+    def dump(self, path: Optional[str] = None) -> str:
+        """Save the call statistics to a JSON file.
+
+        Parameters:
+            path:
+                Save path (default: settings['CALL_STATS_PATH'])
+
+        Returns:
+            The save path
+        """
+
+        path = path or settings['CALL_STATS_PATH']
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
+
+
+class NestBundle(object):
+    """Pre-built namespaces loaded with a single read.
+    """
+
+    def __init__(self, path: str) -> None:
+        import io
+        import zipfile
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        with zipfile.ZipFile(io.BytesIO(data), 'r') as f:
+            self.manifest = json.loads(f.read(BUNDLE_MANIFEST).decode('utf8'))
+            self.members = {v: f.read(v) for v in f.namelist() if v != BUNDLE_MANIFEST}
+        self.path = path
+        # bytecode is only usable by the same python version
+        self.use_bytecode = self.manifest['magic'] == importlib.util.MAGIC_NUMBER.hex()
+
+    def get_source(self, namespace: str, name: str) -> str:
+        return self.members[namespace + '/' + name + '.py'].decode('utf8')
+
+    def get_code(self, namespace: str, name: str) -> object:
+        if self.use_bytecode:
+            return marshal.loads(self.members[namespace + '/' + name + '.pyc'])
+        else:
+            return compile(self.get_source(namespace, name), namespace + '/' + name + '.py', 'exec')
+
+
+class BundleLoader(object):
+    """Load a python module from a Nest bundle.
+    """
+
+    def __init__(self, bundle: NestBundle, namespace: str, name: str) -> None:
+        self.bundle = bundle
+        self.namespace = namespace
+        self.name = name
+
+    def create_module(self, spec: object) -> None:
+        return None
+
+    def exec_module(self, module: ModuleType) -> None:
+        exec(self.bundle.get_code(self.namespace, self.name), module.__dict__)
+
+    def get_source(self, fullname: str) -> str:
+        return self.bundle.get_source(self.namespace, self.name)
+
 
 class ModuleManager(object):
     """Helper class for easy access to Nest modules.
     """
 
+    # cached directory listings {path: (mtime, [file_path, ...])}
+    dir_cache = dict()
+    # discovery counters
+    scan_stats = dict(files_stated=0, dirs_scanned=0, dirs_skipped=0, scan_time=0.0)
+    # registered function names found by source scanning {file_path: (mtime, [name, ...])}
+    source_cache = dict()
+    # loaded bundles {path: (mtime, bundle)}
+    bundles = dict()
+    # intra-namespace imports {file_path: (mtime, [name, ...])}
+    import_cache = dict()
+    # import profile of python modules {file_path: record} (disabled if None)
+    import_profile = None
+
     def __init__(self) -> None:
         self.namespaces = dict()
         self.py_modules = dict()
         self.nest_modules = dict()
         self.update_timestamp = 0.0
+        # namespaces to be imported (None means all)
+        self.active_namespaces = None
+        # namespace metadata cache
+        self.namespace_key = None
+        self.namespace_timestamp = 0.0
+        self.namespace_meta = dict()
         self.namespace_regex = re.compile(r'^[a-z][a-z0-9\_]*\Z')
-        # get available namespaces
-        self._update_namespaces()
+        # discovery and hot-reload are disabled if frozen
+        self.frozen = False
+        # available namespaces are updated on first use
         # import syntax
         self._add_module_finder()
+        # freeze the registry in forked workers
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
 
     @staticmethod
     def _format_namespace(src: str) -> str:
@@ -304,7 +841,10 @@ class ModuleManager(object):
         namespace: str,
         py_modules: Dict[str, float], 
         nest_modules: Dict[str, object], 
-        meta: Dict[str, object] = dict()) -> None:
+        meta: Dict[str, object] = dict(),
+        timestamp: Optional[float] = None,
+        loader: Optional[object] = None,
+        force: bool = False) -> None:
         """Import registered Nest modules form a given file.
 
         Parameters:
@@ -318,15 +858,22 @@ class ModuleManager(object):
                 The dict for storing Nest modules
             meta:
                 Global meta information
+            timestamp:
+                Modified time of the file (read from the file system if not specified)
+            loader:
+                Custom loader of the python module, e.g., for bundled files
+            force:
+                Reload the file even if it is not modified
         """
 
         py_module_name = os.path.basename(path).split('.')[0]
         py_module_id = U.encode_id(namespace, py_module_name)
-        timestamp = os.path.getmtime(path)
+        if timestamp is None:
+            timestamp = os.path.getmtime(path)
         # check whether the python module have already been imported
         is_reload = False
         if py_module_id in py_modules.keys():
-            if timestamp <= py_modules[py_module_id][0]:
+            if timestamp <= py_modules[py_module_id][0] and not force:
                 # skip
                 return
             else:
@@ -334,7 +881,10 @@ class ModuleManager(object):
         # import the python module
         # note that a python module could contain multiple Nest modules.
         ref_id = 'nest.' + namespace + '.' + py_module_name
-        spec = importlib.util.spec_from_file_location(ref_id, path)
+        if loader is None:
+            spec = importlib.util.spec_from_file_location(ref_id, path)
+        else:
+            spec = importlib.util.spec_from_loader(ref_id, loader, origin=path)
         if spec is not None:
             py_module = importlib.util.module_from_spec(spec)
             py_module.__nest_meta__ = U.merge_dict(dict(), meta, union=True)
@@ -343,11 +893,15 @@ class ModuleManager(object):
             if requirements is not None:
                 requirements = [dict(url=v, tool='pip') if isinstance(v, str) else v for v in requirements]
             sys.modules[ref_id] = py_module
+            if ModuleManager.import_profile is not None:
+                profile_start = (time.perf_counter(), time.process_time(), U.get_memory_usage())
             try:
                 with warnings.catch_warnings():
                     warnings.simplefilter("ignore")
                     spec.loader.exec_module(py_module)
             except Exception as exc_info:
+                if ModuleManager.import_profile is not None:
+                    ModuleManager._record_import_profile(path, namespace, profile_start, 'error')
                 # helper function
                 def find_requirement(name):
                     if isinstance(requirements, list) and len(requirements) > 0:
@@ -372,11 +926,89 @@ class ModuleManager(object):
                     for key in py_modules[py_module_id][1]:
                         if key in nest_modules.keys():
                             del nest_modules[key]
+                if ModuleManager.import_profile is not None:
+                    ModuleManager._record_import_profile(path, namespace, profile_start, 'ok')
                 # import all Nest modules within the python module
                 imported_ids = ModuleManager._import_nest_modules_from_py_module(namespace, py_module, nest_modules)
-                if len(imported_ids) > 0:
-                    # record modified time, id, and spec of imported Nest modules
-                    py_modules[py_module_id] = (timestamp, imported_ids, py_module.__spec__)
+                if ModuleManager.import_profile is not None:
+                    ModuleManager.import_profile[path]['modules'] = len(imported_ids)
+                # record modified time, id, spec, and intra-namespace dependencies of the python module
+                deps = ModuleManager._scan_imports(path, namespace, timestamp) if loader is None else []
+                py_modules[py_module_id] = (timestamp, imported_ids, py_module.__spec__, deps)
+
+    @staticmethod
+    def _record_import_profile(path: str, namespace: str, start: tuple, status: str) -> None:
+        """Record wall time, CPU time and memory delta of importing a file.
+
+        Parameters:
+            path:
+                The path to the file
+            namespace:
+                The namespace of the file
+            start:
+                Wall time, CPU time and memory usage before importing
+            status:
+                Import status
+        """
+
+        memory = U.get_memory_usage()
+        ModuleManager.import_profile[path] = dict(
+            path=path,
+            namespace=namespace,
+            status=status,
+            wall=time.perf_counter() - start[0],
+            cpu=time.process_time() - start[1],
+            memory=memory - start[2] if memory is not None and start[2] is not None else None,
+            modules=0)
+
+    @staticmethod
+    def _scan_imports(path: str, namespace: str, timestamp: float) -> List[str]:
+        """Find the python modules of the same namespace imported by a given file.
+
+        Parameters:
+            path:
+                The path to the file
+            namespace:
+                The namespace of the file
+            timestamp:
+                Modified time of the file
+
+        Returns:
+            Names of the imported python modules
+        """
+
+        import ast
+
+        cached = ModuleManager.import_cache.get(path)
+        if cached is not None and cached[0] == timestamp:
+            return cached[1]
+
+        prefix = 'nest.' + namespace
+        deps = set()
+        try:
+            with open(path, 'r', encoding='utf8') as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError, ValueError):
+            tree = None
+        for node in ast.walk(tree) if tree is not None else []:
+            if isinstance(node, ast.Import):
+                # import nest.<namespace>.<name>
+                deps.update([v.name.split('.')[2] for v in node.names if v.name.startswith(prefix + '.')])
+            elif isinstance(node, ast.ImportFrom):
+                module = node.module or ''
+                if node.level == 1:
+                    # from .<name> import ... / from . import <name>
+                    module = prefix + ('.' + module if module else '')
+                elif node.level > 1:
+                    continue
+                if module == prefix:
+                    deps.update([v.name for v in node.names])
+                elif module.startswith(prefix + '.'):
+                    deps.add(module.split('.')[2])
+        deps.discard(os.path.basename(path).split('.')[0])
+        deps = sorted(deps)
+        ModuleManager.import_cache[path] = (timestamp, deps)
+        return deps
 
     @staticmethod
     def _import_nest_modules_from_dir(
@@ -386,6 +1018,7 @@ class ModuleManager(object):
         nest_modules: Dict[str, object],
         meta: Dict[str, object] = dict()) -> None:
         """Import registered Nest modules form a given directory.
+        The directory listing is reused until the mtime of the directory changes.
 
         Parameters:
             path: 
@@ -404,10 +1037,133 @@ class ModuleManager(object):
             The set of python modules
         """
 
-        for entry in os.listdir(path):
-            file_path = os.path.join(path, entry)
-            if entry.endswith('.py') and os.path.isfile(file_path):
-                ModuleManager._import_nest_modules_from_file(file_path, namespace, py_modules, nest_modules, meta)
+        start_time = time.perf_counter()
+        stats = ModuleManager.scan_stats
+        dir_mtime = os.stat(path).st_mtime_ns
+        cached = ModuleManager.dir_cache.get(path)
+        if cached is not None and cached[0] == dir_mtime:
+            # no file has been added, removed or renamed
+            file_list = []
+            for file_path in cached[1]:
+                try:
+                    file_list.append((file_path, os.stat(file_path).st_mtime))
+                except OSError:
+                    pass
+            stats['dirs_skipped'] += 1
+        else:
+            file_list = []
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name.endswith('.py') and entry.is_file():
+                        file_list.append((entry.path, entry.stat().st_mtime))
+            ModuleManager.dir_cache[path] = (dir_mtime, [v[0] for v in file_list])
+            stats['dirs_scanned'] += 1
+        stats['files_stated'] += len(file_list)
+        stats['scan_time'] += time.perf_counter() - start_time
+
+        # find modified files
+        files, deps, modified = dict(), dict(), set()
+        for file_path, timestamp in file_list:
+            name = os.path.basename(file_path).split('.')[0]
+            files[name] = (file_path, timestamp)
+            record = py_modules.get(U.encode_id(namespace, name))
+            if record is None or timestamp > record[0]:
+                modified.add(name)
+                deps[name] = ModuleManager._scan_imports(file_path, namespace, timestamp)
+            else:
+                deps[name] = record[3]
+        if len(modified) == 0:
+            return
+
+        # files depending on modified files are reloaded as well
+        reloads, stack = set(modified), list(modified)
+        while len(stack) > 0:
+            name = stack.pop()
+            for k, v in deps.items():
+                if name in v and not k in reloads:
+                    reloads.add(k)
+                    stack.append(k)
+
+        # dependencies are reloaded before their dependents
+        order, visited = [], set()
+        def visit(name):
+            if name in visited or not name in reloads:
+                return
+            visited.add(name)
+            for v in deps[name]:
+                visit(v)
+            order.append(name)
+        for name in sorted(reloads):
+            visit(name)
+
+        for name in order:
+            file_path, timestamp = files[name]
+            ModuleManager._import_nest_modules_from_file(
+                file_path, namespace, py_modules, nest_modules, meta, timestamp, force=not name in modified)
+
+    @staticmethod
+    def _is_bundle(path: str) -> bool:
+        """Return True if the given file is a Nest bundle.
+
+        Parameters:
+            path:
+                The path to the file
+        """
+
+        import zipfile
+
+        if not zipfile.is_zipfile(path):
+            return False
+        with zipfile.ZipFile(path, 'r') as f:
+            return BUNDLE_MANIFEST in f.namelist()
+
+    @staticmethod
+    def _load_bundle(path: str) -> NestBundle:
+        """Load a Nest bundle (cached until the file is modified).
+
+        Parameters:
+            path:
+                The path to the bundle
+
+        Returns:
+            The bundle
+        """
+
+        mtime = os.stat(path).st_mtime
+        cached = ModuleManager.bundles.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, NestBundle(path))
+            ModuleManager.bundles[path] = cached
+        return cached[1]
+
+    @staticmethod
+    def _import_nest_modules_from_bundle(
+        path: str, 
+        namespace: str,
+        py_modules: Dict[str, float],
+        nest_modules: Dict[str, object],
+        meta: Dict[str, object] = dict()) -> None:
+        """Import registered Nest modules form a given bundle.
+
+        Parameters:
+            path: 
+                The path to the bundle
+            namespace:
+                The bundled namespace
+            py_modules:
+                The dict for storing modified timestamp of python modules
+            nest_modules:
+                The dict for storing Nest modules
+            meta:
+                Global meta information
+        """
+
+        bundle = ModuleManager._load_bundle(path)
+        timestamp = ModuleManager.bundles[path][0]
+        for name in bundle.manifest['namespaces'][namespace]['files']:
+            ModuleManager._import_nest_modules_from_file(
+                os.path.join(path, namespace, name + '.py'), namespace, py_modules, nest_modules, meta, 
+                timestamp, BundleLoader(bundle, namespace, name))
 
     @staticmethod
     def _fetch_nest_modules_from_url(url: str, dst: str) -> None:
@@ -420,8 +1176,8 @@ class ModuleManager(object):
                 Save dir path
         """
 
-        def _hook(count, block_size, total_size):
-            size = float(count * block_size) / (1024.0 * 1024.0)
+        def _hook(size, total_size):
+            size = float(size) / (1024.0 * 1024.0)
             total_size = float(total_size / (1024.0 * 1024.0))
             if total_size > 0:
                 size = min(size, total_size)
@@ -432,25 +1188,40 @@ class ModuleManager(object):
             sys.stdout.flush()
         
         # extract
-        if url.endswith('zip'):
-            import random
-            import string
+        if url.split('#')[0].endswith('zip'):
+            import shutil
             import zipfile
-            from urllib import request, error
-            
-            cache_name = ''.join(random.choice(string.ascii_uppercase + string.digits) for _ in range(6)) + '.cache'
-            cache_path = os.path.join(dst, cache_name)
+            import tempfile
+            from urllib import error
+            from nest import fetch
 
+            # members are extracted to the staging dir while downloading
+            staging_path = tempfile.mkdtemp(prefix='.nest-', dir=dst)
+            extractor = fetch.ZipStreamExtractor(staging_path)
             try:
-                # download
-                request.urlretrieve(url, cache_path, _hook)
+                # download to the shared cache
+                cache_path = fetch.download(url, extractor, _hook)
                 sys.stdout.write('\n')
                 # unzip
                 with zipfile.ZipFile(cache_path, 'r') as f:
-                    file_list = f.namelist()
-                    namespaces = set([v.split('/')[0] for v in file_list])
-                    members = [v for v in file_list if '/' in v]
-                    f.extractall(dst, members)
+                    if extractor.close():
+                        namespaces = ModuleManager._extract_pack(f, staging_path, extracted=True)
+                    else:
+                        # cached or not streamable
+                        shutil.rmtree(staging_path)
+                        os.mkdir(staging_path)
+                        namespaces = ModuleManager._extract_pack(f, staging_path)
+                for namespace in namespaces:
+                    src, target = os.path.join(staging_path, namespace), os.path.join(dst, namespace)
+                    if os.path.exists(target):
+                        # merge into the existing namespace
+                        for root, _, filenames in os.walk(src):
+                            target_root = os.path.join(target, os.path.relpath(root, src))
+                            os.makedirs(target_root, exist_ok=True)
+                            for filename in filenames:
+                                os.replace(os.path.join(root, filename), os.path.join(target_root, filename))
+                    else:
+                        os.replace(src, target)
                 return namespaces
             except error.URLError as exc_info:
                 U.alert_msg('Could not fetch "%s". %s' % (url, exc_info))
@@ -459,16 +1230,22 @@ class ModuleManager(object):
                 U.alert_msg('Error occurs during extraction. %s' % exc_info)
                 return []
             finally:
-                # remove cache
-                if os.path.exists(cache_path):
-                    os.remove(cache_path)
-        elif url.endswith('.git'):
+                shutil.rmtree(staging_path, ignore_errors=True)
+        elif url.endswith('.git') or url.split()[-1].startswith('file://'):
+            from nest import fetch
+
             try:
-                repo_name = url[url.rfind('/')+1: -4]
-                match = re.search(r'(?:\s|^)(?:-b|--branch) (\w+)', url)
-                if match:
-                    repo_name += '-' + match.group(1)
-                subprocess.check_call(['git', 'clone'] + url.split() + [repo_name])
+                repo_url = url.split()[-1]
+                repo_name = os.path.basename(repo_url.rstrip('/'))
+                if repo_name.endswith('.git'):
+                    repo_name = repo_name[:-4]
+                match = re.search(r'(?:\s|^)(?:-b|--branch) (\S+)', url)
+                branch = match.group(1) if match else None
+                if branch is not None:
+                    # e.g., "feature/x" -> "repo-feature-x"
+                    repo_name += '-' + re.sub(r'[^\w\-]', '-', branch)
+                # clone through the mirror cache
+                fetch.clone(repo_url, os.path.join(dst, repo_name), branch)
                 return [repo_name]
             except subprocess.CalledProcessError as exc_info:
                 U.alert_msg('Failed to clone "%s".' % url)
@@ -488,17 +1265,17 @@ class ModuleManager(object):
         """
         # pre-process short URL
         if url.startswith('github@'):
-            m = re.match(r'^github@([\w\-\_]+)/([\w\-\_]+)(:[\w\-\_]+)*$', url)
+            m = re.match(r'^github@([\w\-\_]+)/([\w\-\_]+)(:[\w\-\_\./]+)*$', url)
             repo = m.group(1) + '/' + m.group(2)
             branch = m.group(3) or ':master'
             url = '-b %s https://github.com/%s.git' % (branch[1:], repo)
         elif url.startswith('gitlab@'):
-            m = re.match(r'^gitlab@([\w\-\_]+)/([\w\-\_]+)(:[\w\-\_]+)*$', url)
+            m = re.match(r'^gitlab@([\w\-\_]+)/([\w\-\_]+)(:[\w\-\_\./]+)*$', url)
             repo = m.group(1) + '/' + m.group(2)
             branch = m.group(3) or ':master'
             url = '-b %s https://gitlab.com/%s.git' % (branch[1:], repo)
         elif url.startswith('bitbucket@'):
-            m = re.match(r'^bitbucket@([\w\-\_]+)/([\w\-\_]+)(:[\w\-\_]+)*$', url)
+            m = re.match(r'^bitbucket@([\w\-\_]+)/([\w\-\_]+)(:[\w\-\_\./]+)*$', url)
             repo = m.group(1) + '/' + m.group(2)
             branch = m.group(3) or ':master'
             url = '-b %s https://bitbucket.org/%s.git' % (branch[1:], repo)
@@ -506,30 +1283,132 @@ class ModuleManager(object):
             path = url[5:]
             url = 'file:///' + os.path.abspath(path)
 
+        # requirements of all installed namespaces {tool: [requirement]}
+        requirements = dict()
         for dirname in ModuleManager._fetch_nest_modules_from_url(url, './'):
             module_path = os.path.join('./', dirname)
             ModuleManager._install_namespaces_from_path(module_path, namespace)
             # parse config
             meta_path = os.path.join(module_path, settings['NAMESPACE_CONFIG_FILENAME'])
             meta = U.load_yaml(meta_path)[0] if os.path.exists(meta_path) else dict()
-            if settings['AUTO_INSTALL_REQUIREMENTS']:
-                # auto install deps
-                for dep in meta.get('requirements', []):
-                    # helper function
-                    def install_dep(url, tool):
-                        # filter deps
-                        if re.match(r'^[a-zA-Z0-9<=>.-]+$', dep):
-                            try:
-                                subprocess.check_call([sys.executable, '-m', tool, 'install', dep])
-                            except subprocess.CalledProcessError:
-                                U.alert_msg('Failed to install "%s" for "%s". Please manually install it.' % (dep, dirname))
-                    if isinstance(dep, str):
-                        # use pip by default 
-                        install_dep(dep, 'pip')
-                    elif isinstance(dep, dict) and 'url' in dep and 'tool' in dep:
-                        install_dep(dep['url'], dep['tool'])
-                    else:
-                        U.alert_msg('Invalid install requirement "%s".' % dep)
+            for dep in meta.get('requirements', []):
+                parsed = ModuleManager._parse_requirement(dep)
+                if parsed is None:
+                    U.alert_msg('Invalid install requirement "%s".' % dep)
+                    continue
+                tool, dep = parsed
+                if not dep in requirements.setdefault(tool, []):
+                    requirements[tool].append(dep)
+
+        if settings['AUTO_INSTALL_REQUIREMENTS']:
+            # auto install deps
+            ModuleManager._install_requirements(requirements)
+
+    @staticmethod
+    def _parse_requirement(dep: Any) -> Optional[Tuple[str, str]]:
+        """Parse an install requirement of a namespace.
+
+        Parameters:
+            dep:
+                A requirement specifier (installed with pip), or a dict of {tool, url}
+
+        Returns:
+            The (tool, requirement) pair, or None if invalid
+        """
+
+        if isinstance(dep, str):
+            # filter deps
+            if not re.match(r'^[a-zA-Z0-9<=>.-]+$', dep):
+                return None
+            # use pip by default
+            return 'pip', dep
+        elif isinstance(dep, dict) and 'url' in dep and 'tool' in dep:
+            tool, url = dep['tool'], dep['url']
+            # urls are passed to the tool as-is, so options and extra arguments are rejected
+            if tool not in INSTALL_TOOLS or not isinstance(url, str) \
+                or url == '' or url.startswith('-') or re.search(r'\s', url):
+                return None
+            return tool, url
+        return None
+
+    @staticmethod
+    def _is_requirement_satisfied(requirement: str) -> bool:
+        """Check if a requirement is satisfied by the installed distributions.
+
+        Parameters:
+            requirement:
+                The requirement specifier, e.g., "numpy>=1.16"
+
+        Returns:
+            True if satisfied, otherwise False (including unknown)
+        """
+
+        try:
+            from importlib import metadata
+        except ImportError:
+            return False
+        try:
+            from packaging.requirements import Requirement
+        except ImportError:
+            try:
+                from pip._vendor.packaging.requirements import Requirement
+            except ImportError:
+                Requirement = None
+
+        if Requirement is None:
+            # only bare names could be checked
+            if not re.match(r'^[a-zA-Z0-9._-]+$', requirement):
+                return False
+            name, specifier = requirement, None
+        else:
+            try:
+                parsed = Requirement(requirement)
+            except Exception:
+                return False
+            if parsed.url is not None:
+                return False
+            if parsed.marker is not None and not parsed.marker.evaluate():
+                # not required by the current environment
+                return True
+            name, specifier = parsed.name, parsed.specifier
+        try:
+            version = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            return False
+        return specifier is None or specifier.contains(version, prereleases=True)
+
+    @staticmethod
+    def _install_requirements(requirements: Dict[str, List[str]]) -> None:
+        """Install requirements with one invocation per tool.
+        Satisfied requirements are skipped, and different tools run concurrently.
+        Packages are installed from settings['REQUIREMENTS_WHEELHOUSE'] without network if specified.
+
+        Parameters:
+            requirements:
+                Requirements of each tool, e.g., {'pip': ['numpy>=1.16']}
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        # helper function
+        def install(tool, deps):
+            cmd = [sys.executable, '-m', tool, 'install']
+            wheelhouse = settings['REQUIREMENTS_WHEELHOUSE']
+            if tool == 'pip' and wheelhouse:
+                cmd += ['--no-index', '--find-links', os.path.abspath(os.path.expanduser(wheelhouse))]
+            try:
+                subprocess.check_call(cmd + deps)
+            except subprocess.CalledProcessError:
+                U.alert_msg('Failed to install "%s". Please manually install them.' % ', '.join(deps))
+
+        batches = dict()
+        for tool, deps in requirements.items():
+            deps = [v for v in deps if not ModuleManager._is_requirement_satisfied(v)]
+            if len(deps) > 0:
+                batches[tool] = deps
+        with ThreadPoolExecutor(max_workers=max(len(batches), 1)) as pool:
+            for _ in pool.map(lambda x: install(*x), batches.items()):
+                pass
 
     @staticmethod
     def _install_namespaces_from_path(path: str, namespace: Optional[str] = None) -> None:
@@ -592,113 +1471,768 @@ class ModuleManager(object):
             return path
                 
     @staticmethod
-    def _pack_namespaces(srcs: List[str], dst: str) -> List[str]:
+    def _read_pack_manifest(path: str) -> Optional[Dict[str, Any]]:
+        """Read the manifest of a packed zip file.
+
+        Parameters:
+            path:
+                Path to the zip file
+
+        Returns:
+            The manifest (None if the file is not packed by Nest)
+        """
+
+        import zipfile
+
+        try:
+            with zipfile.ZipFile(path, 'r') as f:
+                return json.loads(f.read(PACK_MANIFEST).decode('utf8'))
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+
+    @staticmethod
+    def _pack_namespaces(srcs: List[str], dst: str, jobs: Optional[int] = None) -> Dict[str, List[str]]:
         """Pack namespaces to a zip file.
+        Members are compressed in parallel and identical files are stored only once.
+        If the zip file exists, unchanged files (by size and mtime, or hash) reuse its compressed data.
+        The manifest records size, mtime, sha256, and the stored member of each file.
 
         Parameters:
             srcs:
                 Path to the namespaces
             dst:
                 Save path for the resulting zip file
+            jobs:
+                Number of compression threads (default: number of CPUs)
         
         Returns:
-            Archived files
+            Archived files of each namespace
         """
 
+        import zlib
+        import struct
+        import hashlib
         import zipfile
-
+        from concurrent.futures import ThreadPoolExecutor
+
+        # helper functions
+        def check_extension(filename):
+            splits = filename.split('.')
+            if len(splits) > 1:
+                # Python file, YAML config, Plain text, Markdown file, Image, and IPython Notebook
+                return splits[-1] in ['py', 'yml', 'txt', 'md', 'jpg', 'png', 'gif', 'ipynb']
+            else:
+                return True
+
+        def hash_file(path):
+            sha = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(block)
+            return sha.hexdigest()
+
+        def compress_file(path):
+            # raw deflate stream (zlib releases the GIL)
+            compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+            crc, chunks = 0, []
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    crc = zlib.crc32(block, crc)
+                    chunks.append(compressor.compress(block))
+            chunks.append(compressor.flush())
+            return crc, b''.join(chunks)
+
+        def write_zip(f, members):
+            # write precompressed members (name, size, mtime, mode, (crc, data)) without ZIP64
+            central_dir = []
+            for name, size, mtime, mode, (crc, data) in members:
+                encoded_name = name.encode('utf8')
+                flags = 0 if encoded_name == name.encode('ascii', 'replace') else 0x800
+                year, month, day, hour, minute, second = time.localtime(max(mtime / 1e9, 315532800))[:6]
+                dos_time = hour << 11 | minute << 5 | second // 2
+                dos_date = (year - 1980) << 9 | month << 5 | day
+                fields = (flags, 8, dos_time, dos_date, crc, len(data), size, len(encoded_name))
+                central_dir.append(struct.pack('<4s4B4HL2L5H2L', b'PK\x01\x02', 20, 3, 20, 0, *fields, 0, 0, 0, 0, 
+                    (mode & 0xFFFF) << 16, f.tell()) + encoded_name)
+                f.write(struct.pack('<4s5HL2L2H', b'PK\x03\x04', 20, *fields, 0) + encoded_name)
+                f.write(data)
+            offset = f.tell()
+            for entry in central_dir:
+                f.write(entry)
+            f.write(struct.pack('<4s4H2LH', b'PK\x05\x06', 0, 0, len(central_dir), len(central_dir), 
+                f.tell() - offset, offset, 0))
+
+        def read_raw(fp, zinfo):
+            fp.seek(zinfo.header_offset + 26)
+            name_len, extra_len = struct.unpack('<HH', fp.read(4))
+            fp.seek(zinfo.header_offset + 30 + name_len + extra_len)
+            return zinfo.CRC, fp.read(zinfo.compress_size)
+
+        # scan files
+        files = dict()
         save_list = dict()
         for src in srcs:
             namespace = os.path.basename(os.path.normpath(src))
-            # helper function
-            def check_extension(filename):
-                splits = filename.split('.')
-                if len(splits) > 1:
-                    # Python file, YAML config, Plain text, Markdown file, Image, and IPython Notebook
-                    return splits[-1] in ['py', 'yml', 'txt', 'md', 'jpg', 'png', 'gif', 'ipynb']
-                else:
-                    return True
-            # scan files
+            if namespace in save_list:
+                raise ValueError('Duplicated namespace "%s" in "%s".' % (namespace, ', '.join(srcs)))
             file_list = []
-            for root, dirs, files in os.walk(src):
+            for root, dirs, filenames in os.walk(src):
                 dirs[:] = [v for v in dirs if not (v[0] == '.' or v.startswith('__'))]
-                file_list += [os.path.join(root, v) for v in files if not v[0] == '.' and check_extension(v)]
+                for v in filenames:
+                    if not v[0] == '.' and check_extension(v):
+                        path = os.path.join(root, v)
+                        arcname = namespace + '/' + os.path.relpath(path, src).replace(os.sep, '/')
+                        stat = os.stat(path)
+                        files[arcname] = dict(path=path, size=stat.st_size, mtime=stat.st_mtime_ns, mode=stat.st_mode)
+                        file_list.append(path)
             save_list[namespace] = file_list
 
-            # save to the zip file
-            with zipfile.ZipFile(dst, 'w', zipfile.ZIP_DEFLATED) as f:
-                for v in file_list:
-                    f.write(v, os.path.join(namespace, os.path.relpath(v, src)))
+        # compare with the existing zip file
+        old_files = (ModuleManager._read_pack_manifest(dst) or dict()).get('files', dict()) if os.path.exists(dst) else dict()
+        for arcname, info in files.items():
+            old_info = old_files.get(arcname)
+            if old_info is not None and old_info['size'] == info['size'] and old_info['mtime'] == info['mtime']:
+                info['sha256'] = old_info['sha256']
+        old_blobs = {v['sha256']: v['blob'] for v in old_files.values()}
+
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+            # hash modified files
+            modified = [v for v in files.values() if 'sha256' not in v]
+            for info, sha in zip(modified, pool.map(lambda x: hash_file(x['path']), modified)):
+                info['sha256'] = sha
+            # deduplicate
+            blobs = dict()
+            for arcname, info in files.items():
+                info['blob'] = blobs.setdefault(info['sha256'], arcname)
+            # compress new contents
+            new_blobs = [k for k, v in blobs.items() if k not in old_blobs]
+            compressed = dict(zip(new_blobs, pool.map(lambda x: compress_file(files[blobs[x]]['path']), new_blobs)))
+
+        manifest = dict(
+            namespaces={k: [v for v, info in files.items() if v.split('/')[0] == k] for k in save_list.keys()},
+            files={k: {key: v[key] for key in ('size', 'mtime', 'sha256', 'blob')} for k, v in files.items()})
+        manifest_data = json.dumps(manifest).encode('utf8')
+        manifest_compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        manifest_blob = (zlib.crc32(manifest_data), manifest_compressor.compress(manifest_data) + manifest_compressor.flush())
+        tmp_path = dst + '.tmp'
+        old_fp = open(dst, 'rb') if len(old_blobs) > 0 else None
+        try:
+            if sum(v['size'] for v in files.values()) + len(manifest_data) >= 0xFFFFFFFF or len(blobs) >= 0xFFFF:
+                # ZIP64 is required, which is written without reusing compressed data
+                with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as f:
+                    for arcname in blobs.values():
+                        f.write(files[arcname]['path'], arcname)
+                    f.writestr(PACK_MANIFEST, manifest_data)
+            else:
+                old_infos = {v.filename: v for v in zipfile.ZipFile(old_fp).infolist()} if old_fp is not None else dict()
+                members = [(arcname, files[arcname]['size'], files[arcname]['mtime'], files[arcname]['mode'],
+                    compressed[sha] if sha in compressed else read_raw(old_fp, old_infos[old_blobs[sha]]))
+                    for sha, arcname in blobs.items()]
+                members.append((PACK_MANIFEST, len(manifest_data), int(time.time() * 1e9), 0o100644, manifest_blob))
+                with open(tmp_path, 'wb') as f:
+                    write_zip(f, members)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        finally:
+            if old_fp is not None:
+                old_fp.close()
+        os.replace(tmp_path, dst)
 
         return save_list
+
+    @staticmethod
+    def _extract_pack(f: object, dst: str, extracted: bool = False) -> List[str]:
+        """Extract namespaces from a zip file.
+        Deduplicated files of packs are restored by the manifest.
+
+        Parameters:
+            f:
+                The opened zipfile.ZipFile
+            dst:
+                Save dir path
+            extracted:
+                Only restore deduplicated files if the members are already extracted
+
+        Returns:
+            The extracted namespaces
+        """
+
+        import shutil
+
+        # helper functions
+        def check_namespace(namespace):
+            if namespace in ('', '.', '..') or any(v in namespace for v in ('/', '\\', ':')):
+                raise ValueError('Unsafe namespace "%s" in the pack.' % namespace)
+            return namespace
+
+        def resolve_path(name):
+            # paths of the manifest should stay in the namespaces of the pack
+            parts = name.split('/')
+            if len(parts) < 2 or not parts[0] in namespaces or \
+                any(v in ('', '.', '..') or '\\' in v or ':' in v for v in parts):
+                raise ValueError('Unsafe path "%s" in the pack manifest.' % name)
+            path = os.path.join(dst, *parts)
+            if os.path.commonpath([os.path.realpath(dst), os.path.realpath(path)]) != os.path.realpath(dst):
+                raise ValueError('Unsafe path "%s" in the pack manifest.' % name)
+            return path
+
+        file_list = f.namelist()
+        namespaces = set([check_namespace(v.split('/')[0]) for v in file_list if '/' in v])
+        members = [v for v in file_list if '/' in v]
+        manifest = json.loads(f.read(PACK_MANIFEST).decode('utf8')) if PACK_MANIFEST in file_list else None
+        if manifest is not None:
+            # namespaces may only consist of deduplicated files
+            namespaces.update([check_namespace(v) for v in manifest['namespaces'].keys()])
+            copies = [(resolve_path(info['blob']), resolve_path(arcname)) 
+                for arcname, info in manifest['files'].items() if info['blob'] != arcname]
+        if not extracted:
+            f.extractall(dst, members)
+        if manifest is not None:
+            for src, path in copies:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                shutil.copyfile(src, path)
+        return namespaces
+
+    @staticmethod
+    def _bundle_namespaces(srcs: List[str], dst: str) -> Dict[str, List[str]]:
+        """Build a bundle of precompiled namespaces.
+
+        Parameters:
+            srcs:
+                Installed namespaces or path to the namespaces
+            dst:
+                Save path for the resulting bundle
+
+        Returns:
+            Bundled files of each namespace
+        """
+
+        import zipfile
+
+        manifest = dict(magic=importlib.util.MAGIC_NUMBER.hex(), namespaces=dict())
+        with zipfile.ZipFile(dst, 'w', zipfile.ZIP_DEFLATED) as f:
+            for src in srcs:
+                if os.path.isdir(src):
+                    path = os.path.abspath(src)
+                    namespace = ModuleManager._format_namespace(os.path.basename(os.path.normpath(src)))
+                elif src in settings['SEARCH_PATHS'] and os.path.isdir(settings['SEARCH_PATHS'][src]):
+                    path, namespace = settings['SEARCH_PATHS'][src], src
+                else:
+                    raise ValueError('"%s" is neither an installed namespace nor a directory.' % src)
+                meta_path = os.path.join(path, settings['NAMESPACE_CONFIG_FILENAME'])
+                meta = U.load_yaml(meta_path)[0] if os.path.exists(meta_path) else dict()
+                module_path = os.path.abspath(os.path.join(path, meta.pop('module_path', './')))
+
+                files, names = [], []
+                for entry in sorted(os.scandir(module_path), key=lambda x: x.name):
+                    if entry.name.endswith('.py') and entry.is_file():
+                        name = entry.name[:-3]
+                        with open(entry.path, 'r', encoding='utf8') as src_file:
+                            source = src_file.read()
+                        arcname = namespace + '/' + entry.name
+                        f.writestr(arcname, source)
+                        f.writestr(arcname + 'c', marshal.dumps(compile(source, arcname, 'exec')))
+                        names += ModuleManager._scan_source(source.split('\n'))
+                        files.append(name)
+                manifest['namespaces'][namespace] = dict(meta=meta, files=files, names=names)
+            f.writestr(BUNDLE_MANIFEST, json.dumps(manifest, default=str))
+
+        return {k: v['files'] for k, v in manifest['namespaces'].items()}
+
+    @staticmethod
+    def _install_namespaces_from_bundle(path: str) -> None:
+        """Install the namespaces of a bundle.
+
+        Parameters:
+            path:
+                Path to the bundle
+        """
+
+        path = os.path.abspath(path)
+        search_paths = settings['SEARCH_PATHS']
+        for namespace in ModuleManager._load_bundle(path).manifest['namespaces'].keys():
+            if namespace in search_paths:
+                U.alert_msg('Namespace "%s" is already bound to the path "%s".' % (namespace, search_paths[namespace]))
+            else:
+                search_paths[namespace] = path
+        settings['SEARCH_PATHS'] = search_paths
+        settings.save()
         
+    def _find_check_tasks(self, srcs: List[str]) -> List[Dict[str, Any]]:
+        """Collect the files to be checked.
+
+        Parameters:
+            srcs:
+                Path to the namespaces or python files (all available namespaces if empty)
+
+        Returns:
+            The check tasks
+        """
+
+        tasks = []
+        if len(srcs) == 0:
+            self._update_namespaces()
+            for namespace, meta in self.namespaces.items():
+                if 'bundle' in meta:
+                    tasks.append(dict(path=meta['bundle'], namespace=namespace, meta=meta, bundle=meta['bundle']))
+                    continue
+                with os.scandir(meta['module_path']) as it:
+                    tasks += [dict(path=v.path, namespace=namespace, meta=meta) 
+                        for v in it if v.name.endswith('.py') and v.is_file()]
+        else:
+            for src in srcs:
+                if os.path.isfile(src):
+                    tasks.append(dict(path=src, namespace='nest_check', meta=dict()))
+                elif os.path.isdir(src):
+                    with os.scandir(src) as it:
+                        tasks += [dict(path=v.path, namespace='nest_check', meta=dict()) 
+                            for v in it if v.name.endswith('.py') and v.is_file()]
+                else:
+                    U.alert_msg('Skipped "%s" as it does not exist.' % src)
+        return sorted(tasks, key=lambda x: (x['namespace'], x['path']))
+
+    @staticmethod
+    def _check_file(task: Dict[str, Any]) -> Dict[str, Any]:
+        """Import a file or a bundled namespace and report the result.
+        This is executed in a checking subprocess.
+
+        Parameters:
+            task:
+                The check task
+
+        Returns:
+            The check result
+        """
+
+        # report problems as errors
+        settings.settings['RAISES_ERROR'] = True
+        ModuleManager.import_profile = dict()
+        py_modules, nest_modules, errors = dict(), dict(), []
+        start_time = time.perf_counter()
+        try:
+            importlib.import_module('nest.' + task['namespace'])
+            if 'bundle' in task:
+                ModuleManager._import_nest_modules_from_bundle(
+                    task['bundle'], task['namespace'], py_modules, nest_modules, task['meta'])
+            else:
+                ModuleManager._import_nest_modules_from_file(
+                    task['path'], task['namespace'], py_modules, nest_modules, task['meta'])
+        except Exception as exc_info:
+            errors.append(str(exc_info))
+        profile = ModuleManager.import_profile.values()
+        return dict(
+            status='error' if len(errors) > 0 else 'ok', 
+            time=time.perf_counter() - start_time, 
+            cpu=sum([v['cpu'] for v in profile]),
+            memory=sum([v['memory'] or 0 for v in profile]),
+            modules=sorted(nest_modules.keys()), 
+            errors=errors)
+
+    @staticmethod
+    def _check_files(
+        tasks: List[Dict[str, Any]], 
+        jobs: Optional[int] = None, 
+        timeout: Optional[float] = None,
+        callback: Optional[Callable] = None) -> List[Dict[str, Any]]:
+        """Check files in parallel subprocesses, one subprocess per file.
+
+        Parameters:
+            tasks:
+                The check tasks
+            jobs:
+                Number of concurrent subprocesses (default: number of CPUs)
+            timeout:
+                Timeout of each file in seconds
+            callback:
+                Called with each result once it is available
+
+        Returns:
+            The check results in the order of tasks
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        script = 'import sys, json; from nest.modules import ModuleManager, CHECK_RESULT_PREFIX; ' \
+            'print(CHECK_RESULT_PREFIX + json.dumps(ModuleManager._check_file(json.loads(sys.argv[1]))))'
+        env = dict(os.environ)
+        package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env['PYTHONPATH'] = os.pathsep.join([package_root] + ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+
+        def run(task):
+            result = dict(path=task['path'], namespace=task['namespace'], status='crash', 
+                time=None, cpu=None, memory=None, modules=[], errors=[])
+            try:
+                proc = subprocess.run([sys.executable, '-c', script, json.dumps(task, default=str)], 
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env, timeout=timeout, universal_newlines=True)
+            except subprocess.TimeoutExpired:
+                result['status'] = 'timeout'
+                result['errors'].append('Timed out after %s seconds.' % timeout)
+            else:
+                lines = [v for v in proc.stdout.split('\n') if v.startswith(CHECK_RESULT_PREFIX)]
+                if len(lines) > 0:
+                    result.update(json.loads(lines[-1][len(CHECK_RESULT_PREFIX):]))
+                else:
+                    result['errors'].append(('Exited with code %d. %s' % (proc.returncode, proc.stderr.strip())).strip())
+            if callback is not None:
+                callback(result)
+            return result
+
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+            return list(executor.map(run, tasks))
+
+    @staticmethod
+    def _filter_ids(key: str, ids: Iterable[str]) -> List[str]:
+        """Filter module ids by a query string.
+        See "__getitem__" for the supported match modes.
+
+        Parameters:
+            key:
+                The query string
+            ids:
+                Module ids
+
+        Returns:
+            The matched ids
+        """
+
+        if key.startswith('$'):
+            # exact match
+            return [key[1:]] if key[1:] in ids else []
+        elif key.startswith('r/'):
+            # regex match
+            return list(filter(re.compile(key[2:]).match, ids))
+        else:
+            # wildcard match
+            if not key[0] == '*':
+                key = '*' + key
+            return fnmatch.filter(ids, key)
+
+    @staticmethod
+    def _scan_source(lines: Iterable[str]) -> List[str]:
+        """Find names of registered functions in python source code.
+
+        Parameters:
+            lines:
+                Lines of the source code
+
+        Returns:
+            The function names
+        """
+
+        names = []
+        decorated = False
+        for line in lines:
+            line = line.strip()
+            if line.startswith('@') and 'register' in line:
+                decorated = True
+            elif line.startswith('def ') or line.startswith('async def '):
+                if decorated:
+                    names.append(line.split('def ', 1)[1].split('(')[0].strip())
+                decorated = False
+        return names
+
+    @staticmethod
+    def _scan_nest_module_names(path: str) -> List[str]:
+        """Find names of registered functions in a given directory without importing it.
+
+        Parameters:
+            path:
+                The path to the directory
+
+        Returns:
+            The function names
+        """
+
+        names = []
+        with os.scandir(path) as it:
+            for entry in it:
+                if not (entry.name.endswith('.py') and entry.is_file()):
+                    continue
+                mtime = entry.stat().st_mtime
+                cached = ModuleManager.source_cache.get(entry.path)
+                if cached is None or cached[0] != mtime:
+                    with open(entry.path, 'r', encoding='utf8', errors='ignore') as f:
+                        cached = (mtime, ModuleManager._scan_source(f))
+                    ModuleManager.source_cache[entry.path] = cached
+                names += cached[1]
+        return names
+
+    def _select_namespaces(self, keys: Optional[List[str]]) -> Optional[List[str]]:
+        """Only import the namespaces that provide the given Nest modules.
+        All namespaces are imported if any of the query strings can not be mapped.
+
+        Parameters:
+            keys:
+                Query strings of the Nest modules, e.g., the "_name" values of a config.
+                Select all namespaces if set to None.
+
+        Returns:
+            The selected namespaces (None means all)
+        """
+
+        selected = None
+        if keys is not None:
+            self._update_namespaces()
+            ids = dict()
+            for namespace, meta in self.namespaces.items():
+                if 'bundle' in meta:
+                    names = ModuleManager._load_bundle(meta['bundle']).manifest['namespaces'][namespace]['names']
+                else:
+                    names = ModuleManager._scan_nest_module_names(meta['module_path'])
+                for name in names:
+                    ids[U.encode_id(namespace, name)] = namespace
+
+            selected = set()
+            for key in keys:
+                matches = ModuleManager._filter_ids(key, ids.keys())
+                if len(matches) == 0:
+                    selected = None
+                    break
+                selected.update([ids[v] for v in matches])
+
+        self.active_namespaces = selected
+        self.update_timestamp = 0.0
+        return None if selected is None else sorted(selected)
+
+    def _expand_namespaces(self) -> bool:
+        """Import all namespaces if only a part of them is selected.
+
+        Returns:
+            True if the selection is expanded, otherwise False.
+        """
+
+        if self.active_namespaces is None:
+            return False
+        self._select_namespaces(None)
+        self._update_modules()
+        return True
+
+    def _unload_namespace(self, namespace: str) -> None:
+        """Forget the imported Nest modules of a namespace.
+
+        Parameters:
+            namespace:
+                The namespace
+        """
+
+        for py_module_id in list(self.py_modules.keys()):
+            if U.decode_id(py_module_id)[0] == namespace:
+                for key in self.py_modules.pop(py_module_id)[1]:
+                    self.nest_modules.pop(key, None)
+        for name in list(sys.modules.keys()):
+            if name == 'nest.' + namespace or name.startswith('nest.' + namespace + '.'):
+                del sys.modules[name]
+        self.update_timestamp = 0.0
+
     def _add_module_finder(self) -> None:
         """Add a custom finder to support Nest module import syntax.
         """
 
         module_manager = self
 
-        class NamespaceLoader(importlib.abc.Loader):
+        class NamespaceLoader(object):
             def create_module(self, spec):
                 _, namespace = spec.name.split('.')
                 module = ModuleType(spec.name)
                 module_manager._update_namespaces()
                 meta = module_manager.namespaces.get(namespace)
-                module.__path__ = [meta['module_path']] if meta else []
+                module.__path__ = [meta['module_path']] if meta and not 'bundle' in meta else []
                 return module
 
             def exec_module(self, module):
                 pass
 
-        class NestModuleFinder(importlib.abc.MetaPathFinder):
+        class NestModuleFinder(object):
             def __init__(self):
-                super(NestModuleFinder, self).__init__()
-                self.reserved_namespaces = [
-                    v[:-3] for v in os.listdir(os.path.dirname(os.path.realpath(__file__))) if v.endswith('.py')]
+                self.reserved_namespaces = None
 
             def find_spec(self, fullname, path, target=None):
                 if fullname.startswith('nest.'):
                     name = fullname.split('.')
                     if len(name) == 2:
+                        if self.reserved_namespaces is None:
+                            self.reserved_namespaces = [
+                                v[:-3] for v in os.listdir(os.path.dirname(os.path.realpath(__file__))) if v.endswith('.py')]
                         if not name[1] in self.reserved_namespaces:
                             return importlib.machinery.ModuleSpec(fullname, NamespaceLoader())
+                    elif len(name) == 3:
+                        # python modules in bundles
+                        meta = module_manager.namespaces.get(name[1])
+                        if meta and 'bundle' in meta:
+                            bundle = ModuleManager._load_bundle(meta['bundle'])
+                            if name[2] in bundle.manifest['namespaces'][name[1]]['files']:
+                                return importlib.util.spec_from_loader(fullname, BundleLoader(bundle, name[1], name[2]), 
+                                    origin=os.path.join(meta['bundle'], name[1], name[2] + '.py'))
 
         sys.meta_path.insert(0, NestModuleFinder())
 
-    def _update_namespaces(self) -> None:
+    def _update_namespaces(self, force: bool = False) -> None:
         """Get the available namespaces.
+        The result is cached until the search paths, the current path, or a namespace config file changes.
+
+        Parameters:
+            force:
+                Ignore the cache
         """
 
+        if self.frozen:
+            return
+
+        timestamp = datetime.now().timestamp()
+        config_filename = settings['NAMESPACE_CONFIG_FILENAME']
+        current_path = os.path.abspath(os.curdir)
+        key = (tuple(sorted(settings['SEARCH_PATHS'].items())), current_path, config_filename)
+        if not force and key == self.namespace_key and \
+            timestamp - self.namespace_timestamp <= settings['UPDATE_INTERVAL']:
+            return
+
         # user defined search paths
         dir_list = set()
-        self.namespaces = dict()
-        for k, v in settings['SEARCH_PATHS'].items():
-            if os.path.isdir(v):
-                meta_path = os.path.join(v, settings['NAMESPACE_CONFIG_FILENAME'])
-                meta = U.load_yaml(meta_path)[0] if os.path.exists(meta_path) else dict()
-                meta['module_path'] = os.path.abspath(os.path.join(v, meta.get('module_path', './')))
-                if os.path.isdir(meta['module_path']):
-                    self.namespaces[k] = meta
-                    dir_list.add(meta['module_path'])
+        namespaces = dict()
+        namespace_meta = dict()
+        for k, v in key[0]:
+            if os.path.isfile(v):
+                # pre-built bundle
+                try:
+                    bundle = ModuleManager._load_bundle(v)
+                except Exception as exc_info:
+                    U.alert_msg('Could not load the bundle "%s" of namespace "%s". %s' % (v, k, exc_info))
+                    continue
+                if k in bundle.manifest['namespaces']:
+                    meta = U.merge_dict(dict(), bundle.manifest['namespaces'][k]['meta'], union=True)
+                    meta['module_path'] = meta['bundle'] = v
+                    namespaces[k] = meta
                 else:
-                    U.alert_msg('Namespace "%s" has an invalid module path "%s".' % (k, meta['module_path']))
+                    U.alert_msg('Namespace "%s" is not found in the bundle "%s".' % (k, v))
+                continue
+            if not os.path.isdir(v):
+                continue
+            meta_path = os.path.join(v, config_filename)
+            try:
+                meta_mtime = os.stat(meta_path).st_mtime_ns
+            except OSError:
+                meta_mtime = None
+            cached = self.namespace_meta.get(v)
+            if cached is not None and cached[0] == meta_mtime:
+                meta = cached[1]
+            else:
+                meta = U.load_yaml(meta_path)[0] if meta_mtime is not None else dict()
+                meta['module_path'] = os.path.abspath(os.path.join(v, meta.get('module_path', './')))
+            namespace_meta[v] = (meta_mtime, meta)
+            if os.path.isdir(meta['module_path']):
+                namespaces[k] = meta
+                dir_list.add(meta['module_path'])
+            else:
+                U.alert_msg('Namespace "%s" has an invalid module path "%s".' % (k, meta['module_path']))
 
         # current path
-        current_path = os.path.abspath(os.curdir)
         if not current_path in dir_list:
-            self.namespaces['main'] = dict(module_path=current_path)
-        
+            namespaces['main'] = dict(module_path=current_path)
+
+        self.namespaces = namespaces
+        self.namespace_meta = namespace_meta
+        self.namespace_key = key
+        self.namespace_timestamp = timestamp
+
     def _update_modules(self) -> None:
         """Automatically import all available Nest modules.
         """
 
+        if self.frozen:
+            return
+
         timestamp = datetime.now().timestamp()
         if timestamp - self.update_timestamp > settings['UPDATE_INTERVAL']:
+            self._update_namespaces()
             for namespace, meta in self.namespaces.items():
+                if self.active_namespaces is not None and not namespace in self.active_namespaces:
+                    continue
                 importlib.import_module('nest.' + namespace)
-                ModuleManager._import_nest_modules_from_dir(meta['module_path'], namespace, self.py_modules, self.nest_modules, meta)
+                if 'bundle' in meta:
+                    ModuleManager._import_nest_modules_from_bundle(meta['bundle'], namespace, self.py_modules, self.nest_modules, meta)
+                else:
+                    ModuleManager._import_nest_modules_from_dir(meta['module_path'], namespace, self.py_modules, self.nest_modules, meta)
             self.update_timestamp = timestamp
 
+    def _profile_imports(self) -> List[Dict[str, Any]]:
+        """Import all namespaces again and profile each file.
+        Packages that have already been imported by the current process are not counted,
+        so run it in a fresh process for accurate results.
+
+        Returns:
+            Profile records sorted by wall time
+        """
+
+        ModuleManager.import_profile = dict()
+        try:
+            self._update_namespaces()
+            for namespace in list(self.namespaces.keys()):
+                self._unload_namespace(namespace)
+            self._update_modules()
+            return sorted(ModuleManager.import_profile.values(), key=lambda x: x['wall'], reverse=True)
+        finally:
+            ModuleManager.import_profile = None
+
+    def _snapshot(self) -> Dict[str, Any]:
+        """Take a snapshot of the registry.
+
+        Returns:
+            The JSON serializable snapshot
+        """
+
+        self._update_modules()
+        files = dict()
+        for py_module_id, (timestamp, ids, spec, _) in self.py_modules.items():
+            if len(ids) > 0:
+                namespace = U.decode_id(py_module_id)[0]
+                files.setdefault(namespace, []).append((spec.origin, timestamp))
+        namespaces = {k: v for k, v in self.namespaces.items() if k in files}
+        return dict(namespaces=namespaces, files=files)
+
+    def _load_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """Import Nest modules from a snapshot and freeze the registry.
+        No directory is scanned.
+
+        Parameters:
+            snapshot:
+                The snapshot taken by "_snapshot"
+        """
+
+        self.frozen = True
+        self.namespaces = snapshot['namespaces']
+        for namespace, files in snapshot['files'].items():
+            meta = self.namespaces[namespace]
+            importlib.import_module('nest.' + namespace)
+            if 'bundle' in meta:
+                ModuleManager._import_nest_modules_from_bundle(meta['bundle'], namespace, self.py_modules, self.nest_modules, meta)
+                continue
+            for path, timestamp in files:
+                ModuleManager._import_nest_modules_from_file(path, namespace, self.py_modules, self.nest_modules, meta, timestamp)
+        self.update_timestamp = datetime.now().timestamp()
+
+    def _freeze(self, frozen: bool = True) -> None:
+        """Turn off discovery and hot-reload.
+        Spawned workers could import the frozen registry without discovery 
+        by passing its snapshot to "init_worker".
+
+        Parameters:
+            frozen:
+                Freeze or unfreeze the registry
+        """
+
+        if frozen:
+            self._update_modules()
+        self.frozen = frozen
+
+    def _after_fork(self) -> None:
+        """Freeze the inherited registry in forked workers.
+        """
+
+        if not self.frozen and self.update_timestamp > 0 and settings['FREEZE_AFTER_FORK']:
+            self.frozen = True
+
     def __iter__(self) -> Iterator:
         """Iterator for Nest modules.
 
@@ -757,6 +2291,8 @@ class ModuleManager(object):
             if key == module_key:
                 matches.append(uid)
         if len(matches) == 0:
+            if self._expand_namespaces():
+                return self.__getattr__(key)
             raise KeyError('Could not find the Nest module "%s".' % key)
         elif len(matches) > 1:
             warnings.warn('Multiple Nest modules with this name have been found. \n'
@@ -788,37 +2324,30 @@ class ModuleManager(object):
 
         self._update_modules()
         if isinstance(key, str):
+            matches = ModuleManager._filter_ids(key, self.nest_modules.keys())
+            if len(matches) == 0 and self._expand_namespaces():
+                matches = ModuleManager._filter_ids(key, self.nest_modules.keys())
             if key.startswith('$'):
                 # exact match
-                key = key[1:]
-                if key in self.nest_modules.keys():
-                    return self.nest_modules[key].clone()
-                else:
-                    raise KeyError('Could not find Nest module "%s".' % key)
+                if len(matches) == 0:
+                    raise KeyError('Could not find Nest module "%s".' % key[1:])
             elif key.startswith('r/'):
                 # regex match
-                key = key[2:]
-                r = re.compile(key)
-                matches = list(filter(r.match, self.nest_modules.keys()))
                 if len(matches) == 0:
-                    raise KeyError('Could not find a Nest module matches regex "%s".' % key)
+                    raise KeyError('Could not find a Nest module matches regex "%s".' % key[2:])
                 elif len(matches) > 1:
                     warnings.warn('Multiple Nest modules match the given regex have been found. \n'
                         'The returned module is "%s", but you can adjust regex to specify others: \n%s' %
                         (matches[0], '\n'.join(['[%d] %s %s' % (k, v, self.nest_modules[v].sig) for k, v in enumerate(matches)])))
-                return self.nest_modules[matches[0]].clone()
             else:
                 # wildcard match
-                if not key[0] == '*':
-                    key = '*' + key
-                matches = fnmatch.filter(self.nest_modules.keys(), key)
                 if len(matches) == 0:
-                    raise KeyError('Could not find a Nest module matches query "%s".' % key)
+                    raise KeyError('Could not find a Nest module matches query "%s".' % (key if key[0] == '*' else '*' + key))
                 elif len(matches) > 1:
                     warnings.warn('Multiple Nest modules match the given regex have been found. \n'
                         'The returned module is "%s", but you can adjust regex to specify others: \n%s' %
                         (matches[0], '\n'.join(['[%d] %s %s' % (k, v, self.nest_modules[v].sig) for k, v in enumerate(matches)])))
-                return self.nest_modules[matches[0]].clone()
+            return self.nest_modules[matches[0]].clone()
         else:
             raise NotImplementedError
     
@@ -836,3 +2365,5 @@ class ModuleManager(object):
 
 # global manager
 module_manager = ModuleManager()
+# global call profiler
+call_profiler = CallProfiler()
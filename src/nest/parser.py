@@ -1,20 +1,140 @@
 import os
 import re
-from typing import Any, Dict, Union, Optional
+import json
+import time
+import asyncio
+import inspect
+import functools
+import threading
+from typing import Any, List, Set, Dict, Union, Callable, Optional
 from datetime import datetime
-from copy import deepcopy
 
 import nest.utils as U
-from nest.modules import module_manager
+from nest.modules import module_manager, call_profiler
 from nest.settings import settings
-from nest.logger import logger
+from nest.logger import logger, trial_context
+
+
+class Tracer(object):
+    """Record config resolution as Chrome Trace Events.
+    """
+
+    def __init__(self) -> None:
+        self.events = []
+        self.trial = None
+        self.origin = time.perf_counter()
+
+    def now(self) -> float:
+        """Timestamp in microseconds.
+        """
+
+        return (time.perf_counter() - self.origin) * 1e6
+
+    def add(self, name: str, category: str, start: float, args: Dict[str, Any] = dict()) -> None:
+        """Add a complete event that ends now.
+
+        Parameters:
+            name:
+                Name of the span
+            category:
+                Category of the span
+            start:
+                Start timestamp in microseconds
+            args:
+                Annotations of the span
+        """
+
+        args = dict(args)
+        if self.trial is not None:
+            args['trial'] = self.trial
+        self.events.append(dict(name=name, cat=category, ph='X', ts=start, dur=self.now() - start,
+            pid=os.getpid(), tid=threading.get_ident(), args=args))
+
+    def save(self, path: str) -> None:
+        """Save the trace to a JSON file.
+
+        Parameters:
+            path:
+                Save path
+        """
+
+        with open(path, 'w') as f:
+            json.dump(dict(traceEvents=self.events, displayTimeUnit='ms'), f, default=str)
+
+
+def _is_variable(name: str) -> bool:
+    return isinstance(name, str) and name.startswith(settings['VARIABLE_PREFIX'])
+
+
+def _resolve_variable(name: str, env_vars: Dict[str, str], global_vars: Dict[str, str]) -> Any:
+    if name[1:] in global_vars.keys():
+        return global_vars[name[1:]]
+    elif name[1:] in env_vars.keys():
+        return env_vars[name[1:]]
+    else:
+        raise TypeError('Could not resolve variable "%s".' % name)
+
+
+def find_dynamic_nodes(config: Union[list, dict], _dynamic: Set[int] = None, _force: bool = False) -> Set[int]:
+    """Find the nodes of a config that are changed by parsing.
+    Other nodes are shared by the resolved configs instead of being copied.
+
+    Parameters:
+        config:
+            The configuration of Nest modules
+        _dynamic:
+            The internal flag that should not be used by the user
+        _force:
+            The internal flag that should not be used by the user
+
+    Returns:
+        The ids of the nodes that refer to variables, define Nest modules or "_var", or contain such nodes
+    """
+
+    if _dynamic is None:
+        _dynamic = set()
+    is_dynamic = _force
+    if isinstance(config, list):
+        for val in config:
+            if _is_variable(val):
+                is_dynamic = True
+            elif isinstance(val, dict):
+                find_dynamic_nodes(val, _dynamic, _force)
+                is_dynamic = is_dynamic or id(val) in _dynamic
+    elif isinstance(config, dict):
+        is_dynamic = is_dynamic or '_name' in config or '_var' in config
+        for key, val in config.items():
+            if _is_variable(val):
+                is_dynamic = True
+            elif isinstance(val, (list, dict)):
+                # variables are merged into the global variables, so they are never shared
+                find_dynamic_nodes(val, _dynamic, _force or key == '_var')
+                is_dynamic = is_dynamic or id(val) in _dynamic
+    if is_dynamic:
+        _dynamic.add(id(config))
+    return _dynamic
+
+
+def _copy_static(node: Any) -> Any:
+    # static nodes only consist of YAML containers and immutable scalars
+    if isinstance(node, list):
+        return [_copy_static(v) for v in node]
+    elif isinstance(node, dict):
+        return {k: _copy_static(v) for k, v in node.items()}
+    return node
 
 
 def parse_config(
     config: Union[list, dict],
     env_vars: Dict[str, str] = dict(),
-    global_vars: Dict[str, str] = dict()) -> Union[list, dict]:
+    global_vars: Dict[str, str] = dict(),
+    tracer: Optional[Tracer] = None,
+    _path: List[str] = None,
+    _dynamic: Set[int] = None,
+    _copy: bool = False) -> Union[list, dict]:
     """Parse experiment config.
+    The config is not modified. Nodes without variables or Nest modules are shared by the resolved config,
+    except that Nest modules receive private copies of them.
 
     Parameters:
         config:
@@ -23,60 +143,392 @@ def parse_config(
             The environment variables
         global_vars:
             The global variables
+        tracer:
+            Record the resolution of Nest modules if specified
+        _path:
+            The internal flag that should not be used by the user
+        _dynamic:
+            The internal flag that should not be used by the user
+        _copy:
+            The internal flag that should not be used by the user
 
     Returns:
         The resolved config
     """
 
-    def is_variable(name: str) -> bool:
-        return isinstance(name, str) and name.startswith(settings['VARIABLE_PREFIX'])
+    # helper function
+    def parse_value(val: Any, path: List[str]) -> Any:
+        if _is_variable(val):
+            return _resolve_variable(val, env_vars, global_vars)
+        elif isinstance(val, dict) and id(val) in _dynamic:
+            return parse_config(val, env_vars=env_vars, global_vars=global_vars,
+                tracer=tracer, _path=path, _dynamic=_dynamic, _copy=copy)
+        return _copy_static(val) if copy else val
+
+    if _path is None:
+        _path = []
+    if _dynamic is None:
+        _dynamic = find_dynamic_nodes(config)
+    if not id(config) in _dynamic:
+        return config
+    # params of Nest modules are copied, as modules may modify them
+    copy = _copy or (isinstance(config, dict) and '_name' in config)
+    if tracer is not None:
+        start_time = tracer.now()
 
-    def resolve_variable(name: str) -> Any:
-        if name[1:] in global_vars.keys():
-            return global_vars[name[1:]]
-        elif name[1:] in env_vars.keys():
-            return env_vars[name[1:]]
+    if isinstance(config, list):
+        return [parse_value(val, _path+[str(idx)]) for idx, val in enumerate(config)]
+    elif isinstance(config, dict):
+        resolved_config = dict()
+        for key, val in config.items():
+            if isinstance(val, list) and id(val) in _dynamic:
+                resolved_config[key] = [parse_value(sub_val, _path+[str(key), str(sub_idx)]) 
+                    for sub_idx, sub_val in enumerate(val)]
+            else:
+                resolved_config[key] = parse_value(val, _path+[str(key)])
+                if key == '_var' and isinstance(val, dict):
+                    U.merge_dict(global_vars, resolved_config[key], union=True)
+
+        nest_module_name = resolved_config.pop('_name', None)
+        if nest_module_name:
+            nest_module = module_manager[nest_module_name]
+            if tracer is not None:
+                call_start_time = tracer.now()
+            if settings['PARSER_STRICT']:
+                resolved = nest_module(**resolved_config)
+            else:
+                resolved = nest_module(**resolved_config, delay_resolve=True)
+            if inspect.iscoroutine(resolved):
+                resolved.close()
+                raise RuntimeError('Nest module "%s" is async. Please resolve the config in async mode.' % nest_module.__name__)
+            if tracer is not None:
+                key_path = '.'.join(_path) or '<root>'
+                module_id = nest_module.module_id
+                tracer.add(module_id, 'module', call_start_time, dict(key_path=key_path))
+                tracer.add(key_path, 'config', start_time, dict(module_id=module_id))
+            return resolved
+        return resolved_config
+
+    return config
+
+
+async def parse_config_async(
+    config: Union[list, dict],
+    env_vars: Dict[str, str] = dict(),
+    global_vars: Dict[str, str] = dict(),
+    tracer: Optional[Tracer] = None,
+    _path: List[str] = None,
+    _dynamic: Set[int] = None,
+    _copy: bool = False) -> Union[list, dict]:
+    """Parse experiment config with async Nest modules awaited.
+    Independent nodes are resolved concurrently on the running event loop, 
+    while the "_var" node is resolved in place so that the following nodes could refer to its variables.
+    The config is not modified. Nodes without variables or Nest modules are shared by the resolved config,
+    except that Nest modules receive private copies of them.
+
+    Parameters:
+        config:
+            The configuration of Nest modules, which specifies initial parameters, topologies, etc. 
+        env_vars:
+            The environment variables
+        global_vars:
+            The global variables
+        tracer:
+            Record the resolution of Nest modules if specified
+        _path:
+            The internal flag that should not be used by the user
+        _dynamic:
+            The internal flag that should not be used by the user
+        _copy:
+            The internal flag that should not be used by the user
+
+    Returns:
+        The resolved config
+    """
+
+    # helper function
+    async def gather(pending: list) -> None:
+        results = await asyncio.gather(*[v for _, _, v in pending])
+        for (container, key, _), result in zip(pending, results):
+            container[key] = result
+        pending.clear()
+
+    def parse_value(container: Union[list, dict], key: Any, val: Any, path: List[str]) -> None:
+        if _is_variable(val):
+            container[key] = _resolve_variable(val, env_vars, global_vars)
+        elif isinstance(val, dict) and id(val) in _dynamic:
+            container[key] = None
+            pending.append((container, key, parse_config_async(val, env_vars=env_vars, global_vars=global_vars, 
+                tracer=tracer, _path=path, _dynamic=_dynamic, _copy=copy)))
         else:
-            raise TypeError('Could not resolve variable "%s".' % name)
+            container[key] = _copy_static(val) if copy else val
 
+    if _path is None:
+        _path = []
+    if _dynamic is None:
+        _dynamic = find_dynamic_nodes(config)
+    if not id(config) in _dynamic:
+        return config
+    # params of Nest modules are copied, as modules may modify them
+    copy = _copy or (isinstance(config, dict) and '_name' in config)
+    if tracer is not None:
+        start_time = tracer.now()
+
+    pending = []
     if isinstance(config, list):
+        resolved_config = [None] * len(config)
         for idx, val in enumerate(config):
-            if is_variable(val):
-                config[idx] = resolve_variable(val)
-            elif isinstance(val, dict):
-                config[idx] = parse_config(val, env_vars=env_vars, global_vars=global_vars)
+            parse_value(resolved_config, idx, val, _path+[str(idx)])
     elif isinstance(config, dict):
+        resolved_config = dict()
         for key, val in config.items():
-            if is_variable(val):
-                config[key] = resolve_variable(val)
-            elif isinstance(val, list):
+            if isinstance(val, list) and id(val) in _dynamic:
+                resolved_config[key] = [None] * len(val)
                 for sub_idx, sub_val in enumerate(val):
-                    if is_variable(sub_val):
-                        val[sub_idx] = resolve_variable(sub_val)
-                    elif isinstance(sub_val, dict):
-                        val[sub_idx] = parse_config(sub_val, env_vars=env_vars, global_vars=global_vars)
-            elif isinstance(val, dict):
-                config[key] = parse_config(
-                    val, env_vars=env_vars, global_vars=global_vars)
-                if key == '_var':
-                    U.merge_dict(global_vars, config[key], union=True)
+                    parse_value(resolved_config[key], sub_idx, sub_val, _path+[str(key), str(sub_idx)])
+            elif key == '_var' and isinstance(val, dict):
+                # preceding nodes should not see the variables
+                await gather(pending)
+                resolved_config[key] = await parse_config_async(
+                    val, env_vars=env_vars, global_vars=global_vars, tracer=tracer, _path=_path+[str(key)], _dynamic=_dynamic, _copy=copy)
+                U.merge_dict(global_vars, resolved_config[key], union=True)
+            else:
+                parse_value(resolved_config, key, val, _path+[str(key)])
+    else:
+        return config
+    await gather(pending)
 
-        nest_module_name = config.pop('_name', None)
+    if isinstance(resolved_config, dict):
+        nest_module_name = resolved_config.pop('_name', None)
         if nest_module_name:
             nest_module = module_manager[nest_module_name]
+            if tracer is not None:
+                call_start_time = tracer.now()
             if settings['PARSER_STRICT']:
-                return nest_module(**config)
+                resolved = nest_module(**resolved_config)
             else:
-                return nest_module(**config, delay_resolve=True)
+                resolved = nest_module(**resolved_config, delay_resolve=True)
+            if inspect.isawaitable(resolved):
+                resolved = await resolved
+            if tracer is not None:
+                key_path = '.'.join(_path) or '<root>'
+                module_id = nest_module.module_id
+                tracer.add(module_id, 'module', call_start_time, dict(key_path=key_path))
+                tracer.add(key_path, 'config', start_time, dict(module_id=module_id))
+            return resolved
+
+    return resolved_config
 
-    return config
+
+def _check_all_resolved(resolved_config: Any) -> None:
+    if isinstance(resolved_config, list):
+        for v in resolved_config:
+            _check_all_resolved(v)
+    elif isinstance(resolved_config, dict):
+        for v in resolved_config.values():
+            _check_all_resolved(v)
+    elif type(resolved_config).__name__ == 'NestModule':
+        raise RuntimeError('Unresolved Nest module found in the result.\n%s' % (
+            U.indent_text(str(resolved_config), 4)))
+
+
+def _run_trial(
+    resolve: Callable,
+    config: Union[list, dict],
+    env_vars: Dict[str, str],
+    global_vars: Dict[str, Any],
+    tracer: Optional[Tracer] = None) -> Dict[str, Any]:
+    """Resolve the config of a trial and measure its memory.
+    The resolved config is released after measuring, only its scalars are kept for the results database.
+
+    Parameters:
+        resolve:
+            "parse_config" or its async counterpart
+        config:
+            The config of the trial
+        env_vars:
+            The environment variables
+        global_vars:
+            The global variables
+        tracer:
+            Record the resolution of Nest modules if specified
+
+    Returns:
+        The report of the trial
+    """
+
+    from nest.results import flatten
+
+    report = dict(status='finished', returns=None, error=None, exception=None, peak_memory=None, top_allocations=None)
+    top = settings['TRACEMALLOC_TOP']
+    if top:
+        import tracemalloc
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+    exact_peak = U.reset_peak_memory_usage()
+    resolved_config = None
+    try:
+        resolved_config = resolve(config, env_vars=env_vars, global_vars=global_vars, tracer=tracer)
+        _check_all_resolved(resolved_config)
+        report['returns'] = flatten(resolved_config)
+    except BaseException as exc_info:
+        report.update(status='canceled' if isinstance(exc_info, KeyboardInterrupt) else 'failed',
+            error='%s: %s' % (type(exc_info).__name__, exc_info), exception=exc_info)
+    if exact_peak:
+        report['peak_memory'] = U.get_peak_memory_usage()
+    if top:
+        # snapshot while the resolved config is alive so that its allocations are reported
+        statistics = tracemalloc.take_snapshot().statistics('lineno')
+        report['top_allocations'] = [str(v) for v in statistics[:top]]
+        if not tracing:
+            tracemalloc.stop()
+    del resolved_config
+    return report
+
+
+def _trial_worker(
+    conn: Any,
+    config: Union[list, dict],
+    env_vars: Dict[str, str],
+    global_vars: Dict[str, Any],
+    async_mode: bool,
+    trace_origin: Optional[float],
+    trial: Optional[int]) -> None:
+    """Resolve a trial in a child process and send the report back.
+    """
+
+    import traceback
+
+    tracer = None
+    if trace_origin is not None:
+        tracer = Tracer()
+        tracer.origin = trace_origin
+        tracer.trial = trial
+    trial_context.set(trial)
+    if async_mode:
+        loop = asyncio.new_event_loop()
+        resolve = lambda *args, **kwargs: loop.run_until_complete(parse_config_async(*args, **kwargs))
+    else:
+        resolve = parse_config
+    try:
+        report = _run_trial(resolve, config, env_vars, global_vars, tracer)
+        # exceptions may not be picklable
+        exc_info = report.pop('exception')
+        if exc_info is not None:
+            report['traceback'] = ''.join(traceback.format_exception(type(exc_info), exc_info, exc_info.__traceback__))
+        report['trace_events'] = tracer.events if tracer is not None else []
+        conn.send(report)
+    finally:
+        conn.close()
+        if async_mode:
+            loop.close()
+        # forked processes exit without flushing
+        for handler in logger.handlers:
+            handler.flush()
+
+
+def _run_trial_in_child(
+    config: Union[list, dict],
+    env_vars: Dict[str, str],
+    global_vars: Dict[str, Any],
+    async_mode: bool,
+    tracer: Optional[Tracer] = None) -> Dict[str, Any]:
+    """Resolve the config of a trial in a fresh child process, so that all its memory is returned to the OS.
+    The child is forked if supported (which inherits imported modules), otherwise spawned.
+
+    Parameters:
+        config:
+            The config of the trial
+        env_vars:
+            The environment variables
+        global_vars:
+            The global variables
+        async_mode:
+            Await async Nest modules
+        tracer:
+            Record the resolution of Nest modules if specified
+
+    Returns:
+        The report of the trial
+    """
+
+    import multiprocessing
+
+    ctx = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn')
+    recv_conn, send_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_trial_worker, args=(send_conn, config, env_vars, global_vars, async_mode,
+        tracer.origin if tracer is not None else None, tracer.trial if tracer is not None else None))
+    process.start()
+    send_conn.close()
+    try:
+        report = recv_conn.recv()
+    except EOFError:
+        process.join()
+        message = 'Trial process exited unexpectedly with code %s.' % process.exitcode
+        report = dict(status='failed', returns=None, error=message, traceback=message,
+            peak_memory=None, top_allocations=None, trace_events=[])
+    except KeyboardInterrupt as exc_info:
+        process.join(5)
+        if process.is_alive():
+            process.terminate()
+        report = dict(status='canceled', returns=None, error='KeyboardInterrupt: ', exception=exc_info,
+            peak_memory=None, top_allocations=None, trace_events=[])
+    finally:
+        recv_conn.close()
+    process.join()
+    if tracer is not None:
+        tracer.events += report.pop('trace_events')
+    if report.get('exception') is None:
+        report['exception'] = None if report['status'] == 'finished' else \
+            RuntimeError('Trial failed in the child process.\n%s' % U.indent_text(report['traceback'].rstrip(), 4))
+    return report
+
+
+def find_module_names(config: Union[list, dict]) -> Optional[List[str]]:
+    """Find the Nest modules referenced by a config.
+
+    Parameters:
+        config:
+            The configuration of Nest modules
+
+    Returns:
+        The "_name" values (None if any of them is a variable)
+    """
+
+    names = []
+    if isinstance(config, list):
+        for val in config:
+            if isinstance(val, (list, dict)):
+                sub_names = find_module_names(val)
+                if sub_names is None:
+                    return None
+                names += sub_names
+    elif isinstance(config, dict):
+        for key, val in config.items():
+            if key == '_name':
+                if not isinstance(val, str) or val.startswith(settings['VARIABLE_PREFIX']):
+                    return None
+                names.append(val)
+            elif isinstance(val, (list, dict)):
+                sub_names = find_module_names(val)
+                if sub_names is None:
+                    return None
+                names += sub_names
+    return names
 
 
 def run_tasks(
     config_file: str, 
     param_file: Optional[str] = None, 
-    verbose: bool = False) -> None:
+    verbose: bool = False,
+    trace_file: Optional[str] = None,
+    async_mode: bool = False,
+    status_file: Optional[str] = None,
+    metrics_port: Optional[int] = None,
+    isolated: bool = False) -> None:
     """Run experiment tasks by resolving config.
+    Memory of each trial is released before the next one starts.
 
     Parameters:
         config_file:
@@ -85,25 +537,67 @@ def run_tasks(
             The path to the parameter file
         verbose:
             Show verbose information
+        trace_file:
+            Save the timeline of config resolution to a Chrome Trace file if specified
+        async_mode:
+            Await async Nest modules and resolve independent nodes concurrently on one event loop
+        status_file:
+            Refresh the progress of trials in the JSON file if specified
+        metrics_port:
+            Serve the progress in Prometheus text format on the local port if specified
+        isolated:
+            Resolve each trial in a fresh child process
     """
 
     # helper function
-    def check_all_resolved(resolved_config: Any) -> None:
-        if isinstance(resolved_config, list):
-            for v in resolved_config:
-                check_all_resolved(v)
-        elif isinstance(resolved_config, dict):
-            for v in resolved_config.values():
-                check_all_resolved(v)
-        elif type(resolved_config).__name__ == 'NestModule':
-            raise RuntimeError('Unresolved Nest module found in the result.\n%s' % (
-                U.indent_text(str(resolved_config), 4)))
+    def run_trial(idx: int, trial_config: Union[list, dict], trial_vars: Dict[str, Any]) -> None:
+        trial_start_time = time.time()
+        if progress is not None:
+            progress.start_trial(idx)
+        if isolated:
+            report = _run_trial_in_child(trial_config, env_vars, trial_vars, async_mode, tracer)
+        else:
+            report = _run_trial(resolve, trial_config, env_vars, trial_vars, tracer)
+        peak_memory = report['peak_memory']
+        if progress is not None:
+            peak_memory = progress.finish_trial(idx, report['status'], peak_memory)['peak_memory']
+        if store is not None:
+            store.add(idx, trial_vars, report['status'], trial_start_time, report['returns'], report['error'], peak_memory)
+        if report['top_allocations']:
+            logger.info('Top allocations of trial %d:\n%s' % (idx, U.indent_text('\n'.join(report['top_allocations']), 4)))
+        if report['exception'] is not None:
+            raise report['exception']
+
+    tracer = Tracer() if trace_file else None
+    store = None
+    progress = None
+    if async_mode:
+        loop = asyncio.new_event_loop()
+        resolve = lambda *args, **kwargs: loop.run_until_complete(parse_config_async(*args, _dynamic=dynamic, **kwargs))
+    else:
+        resolve = lambda *args, **kwargs: parse_config(*args, _dynamic=dynamic, **kwargs)
 
     # start resolving config
     try:
         start_time = datetime.now()
         # load config file
         config, raw = U.load_yaml(config_file)
+        # the config is not modified by parsing, so it is shared by all trials
+        dynamic = find_dynamic_nodes(config)
+        if settings['RESULTS_DB']:
+            import sqlite3
+            from nest.results import ResultStore
+            db_path = os.path.join(os.path.dirname(os.path.abspath(config_file)), settings['RESULTS_DB'])
+            try:
+                store = ResultStore(db_path, config_file)
+            except (sqlite3.Error, OSError) as exc_info:
+                U.alert_msg('Could not open the results database "%s" (%s). Trials are not recorded.' % (db_path, exc_info))
+        # only import the namespaces used by the config
+        module_names = find_module_names(config)
+        if module_names is not None:
+            namespaces = module_manager._select_namespaces(module_names)
+            if verbose and namespaces is not None:
+                logger.info('Selected namespaces: %s' % ', '.join(namespaces))
         # load environment variables
         env_vars = {k: v for k, v in os.environ.items()}
         # record raw config
@@ -117,6 +611,9 @@ def run_tasks(
             param_list, _ = U.load_yaml(param_file)
             if not isinstance(param_list, list):
                 param_list = [param_list]
+            if verbose or status_file or metrics_port:
+                from nest.progress import Progress
+                progress = Progress(len(param_list), status_file, metrics_port)
             for idx, param in enumerate(param_list):
                 param_start_time = datetime.now()
                 if isinstance(param, dict):
@@ -128,17 +625,86 @@ def run_tasks(
                 if verbose:
                     logger.info('(%d/%d) Resolving with parameters: \n' % (idx + 1, len(param_list)) + env_vars['PARAMS'])
                 # parse config with updated vars
-                resolved_config = parse_config(deepcopy(config), env_vars=env_vars, global_vars=global_vars)
-                check_all_resolved(resolved_config)  
-                if verbose:
-                    end_time = datetime.now()
-                    logger.info('Finished (%s).' % (U.format_elapse(seconds=(end_time - param_start_time).total_seconds())))
+                if tracer is not None:
+                    tracer.trial = idx
+                    trial_start_time = tracer.now()
+                token = trial_context.set(idx)
+                try:
+                    run_trial(idx, config, global_vars)
+                    U.release_memory()
+                    if tracer is not None:
+                        # global variables are updated in place, so a snapshot is recorded
+                        tracer.add('trial %d' % idx, 'trial', trial_start_time,
+                            dict(params=json.loads(json.dumps(global_vars, default=str))))
+                    if verbose:
+                        end_time = datetime.now()
+                        logger.info('Finished (%s). %s' % (
+                            U.format_elapse(seconds=(end_time - param_start_time).total_seconds()), progress.format_status()))
+                finally:
+                    trial_context.reset(token)
         else:
-            resolved_config = parse_config(config, env_vars=env_vars)
-            check_all_resolved(resolved_config)
+            if status_file or metrics_port:
+                from nest.progress import Progress
+                progress = Progress(1, status_file, metrics_port)
+            run_trial(0, config, dict())
         
         end_time = datetime.now()
         logger.info('All finished. (%s)' % U.format_elapse(seconds=(end_time - start_time).total_seconds()))
 
     except KeyboardInterrupt:
         logger.info('Processing is canceled by user.')
+    finally:
+        if async_mode:
+            loop.close()
+        if progress is not None:
+            progress.close()
+        if store is not None:
+            store.close()
+            if verbose:
+                logger.info('Results are saved to "%s".' % store.path)
+        module_manager._select_namespaces(None)
+        if tracer is not None:
+            tracer.save(trace_file)
+            if verbose:
+                logger.info('Trace is saved to "%s".' % trace_file)
+        if call_profiler.is_enabled():
+            path = call_profiler.dump()
+            if verbose:
+                logger.info('Call statistics are saved to "%s".' % path)
+        # write out queued log records
+        for handler in logger.handlers:
+            handler.flush()
+
+
+async def arun_tasks(
+    config_file: str, 
+    param_file: Optional[str] = None, 
+    verbose: bool = False,
+    trace_file: Optional[str] = None,
+    status_file: Optional[str] = None,
+    metrics_port: Optional[int] = None,
+    isolated: bool = False) -> None:
+    """Run experiment tasks in async mode without blocking the running event loop.
+    Tasks are resolved in a worker thread with its own event loop.
+
+    Parameters:
+        config_file:
+            The path to the config file
+        param_file:
+            The path to the parameter file
+        verbose:
+            Show verbose information
+        trace_file:
+            Save the timeline of config resolution to a Chrome Trace file if specified
+        status_file:
+            Refresh the progress of trials in the JSON file if specified
+        metrics_port:
+            Serve the progress in Prometheus text format on the local port if specified
+        isolated:
+            Resolve each trial in a fresh child process
+    """
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, functools.partial(
+        run_tasks, config_file, param_file, verbose=verbose, trace_file=trace_file, async_mode=True,
+        status_file=status_file, metrics_port=metrics_port, isolated=isolated))
@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+import nest.utils as U
+
+
+class Progress(object):
+    """Track the progress of a parameter sweep.
+    A background thread samples the memory usage of running trials, refreshes the status file,
+    and the progress could be scraped in Prometheus text format from "http://127.0.0.1:<port>/metrics".
+    """
+
+    def __init__(
+        self,
+        total: int,
+        status_file: Optional[str] = None,
+        port: Optional[int] = None,
+        window: int = 10,
+        interval: float = 1.0) -> None:
+        self.total = total
+        self.status_file = status_file
+        self.interval = interval
+        self.start_time = time.time()
+        self.counts = dict(finished=0, failed=0, canceled=0)
+        self.running = dict()
+        self.durations = deque(maxlen=window)
+        self.last_trial = None
+        self.lock = threading.Lock()
+        # the status file is written by both the caller and the monitor thread
+        self.write_lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.server = None
+        if port is not None:
+            self._serve(port)
+        self.thread = threading.Thread(target=self._monitor, name='nest-progress', daemon=True)
+        self.thread.start()
+
+    def start_trial(self, idx: int) -> None:
+        """Mark a trial as running.
+
+        Parameters:
+            idx:
+                Index of the trial
+        """
+
+        memory = U.get_memory_usage()
+        with self.lock:
+            self.running[idx] = dict(start_time=time.time(), peak_memory=memory)
+
+    def finish_trial(self, idx: int, status: str, peak_memory: Optional[int] = None) -> Dict[str, Any]:
+        """Mark a trial as finished.
+
+        Parameters:
+            idx:
+                Index of the trial
+            status:
+                "finished", "failed", or "canceled"
+            peak_memory:
+                Peak memory of the trial measured by the caller (sampled if not specified)
+
+        Returns:
+            The record of the trial
+        """
+
+        memory = U.get_memory_usage()
+        with self.lock:
+            trial = self.running.pop(idx)
+            if peak_memory is not None:
+                trial['peak_memory'] = peak_memory
+            elif memory is not None and (trial['peak_memory'] is None or memory > trial['peak_memory']):
+                trial['peak_memory'] = memory
+            elapsed = time.time() - trial['start_time']
+            self.counts[status] += 1
+            if status == 'finished':
+                self.durations.append(elapsed)
+            self.last_trial = dict(trial=idx, status=status, elapsed=elapsed, peak_memory=trial['peak_memory'])
+        self._write_status()
+        return self.last_trial
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the current progress.
+
+        Returns:
+            The progress dict
+        """
+
+        with self.lock:
+            done = sum(self.counts.values())
+            mean_duration = sum(self.durations) / len(self.durations) if len(self.durations) > 0 else None
+            remaining = max(self.total - done, 0)
+            return dict(
+                total=self.total,
+                done=done,
+                running=len(self.running),
+                finished=self.counts['finished'],
+                failed=self.counts['failed'],
+                canceled=self.counts['canceled'],
+                elapsed=time.time() - self.start_time,
+                trials_per_hour=3600.0 / mean_duration if mean_duration else None,
+                eta=mean_duration * remaining if mean_duration is not None else None,
+                memory=U.get_memory_usage(),
+                running_trials={k: dict(elapsed=time.time() - v['start_time'], peak_memory=v['peak_memory'])
+                    for k, v in self.running.items()},
+                last_trial=self.last_trial,
+                updated=time.time())
+
+    def format_status(self) -> str:
+        """Format the progress as a compact status line.
+        """
+
+        status = self.snapshot()
+        line = '[%d/%d] finished %d, failed %d' % (status['done'], status['total'], status['finished'], status['failed'])
+        if status['trials_per_hour'] is not None:
+            line += ' | %.1f trials/h' % status['trials_per_hour']
+        if status['eta'] is not None and status['done'] < status['total']:
+            line += ' | ETA %s' % (U.format_elapse(seconds=int(status['eta'])) or '0 second')
+        if status['last_trial'] is not None and status['last_trial']['peak_memory'] is not None:
+            line += ' | peak %.1f MB' % (status['last_trial']['peak_memory'] / (1024.0 * 1024.0))
+        return line
+
+    def format_prometheus(self) -> str:
+        """Format the progress in Prometheus text format.
+        """
+
+        status = self.snapshot()
+        metrics = [
+            ('nest_trials_total', 'Number of trials of the sweep.', status['total']),
+            ('nest_trials_done', 'Number of completed trials.', status['done']),
+            ('nest_trials_running', 'Number of running trials.', status['running']),
+            ('nest_trials_finished', 'Number of finished trials.', status['finished']),
+            ('nest_trials_failed', 'Number of failed trials.', status['failed']),
+            ('nest_trials_per_hour', 'Throughput from the moving average of trial durations.', status['trials_per_hour']),
+            ('nest_eta_seconds', 'Estimated remaining time.', status['eta']),
+            ('nest_elapsed_seconds', 'Elapsed time of the sweep.', status['elapsed']),
+            ('nest_memory_bytes', 'Resident memory of the process.', status['memory']),
+            ('nest_last_trial_peak_memory_bytes', 'Peak resident memory of the last completed trial.',
+                status['last_trial']['peak_memory'] if status['last_trial'] is not None else None),
+        ]
+        lines = []
+        for name, doc, val in metrics:
+            if val is not None:
+                lines += ['# HELP %s %s' % (name, doc), '# TYPE %s gauge' % name, '%s %s' % (name, float(val))]
+        return '\n'.join(lines) + '\n'
+
+    def close(self) -> None:
+        """Stop monitoring and write the final status.
+        """
+
+        self.stopped.set()
+        self.thread.join()
+        self._write_status()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def _monitor(self) -> None:
+        while not self.stopped.wait(self.interval):
+            memory = U.get_memory_usage()
+            if memory is not None:
+                with self.lock:
+                    for trial in self.running.values():
+                        if trial['peak_memory'] is None or memory > trial['peak_memory']:
+                            trial['peak_memory'] = memory
+            self._write_status()
+
+    def _write_status(self) -> None:
+        if self.status_file is None:
+            return
+        tmp_path = self.status_file + '.tmp'
+        with self.write_lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.snapshot(), f, indent=2)
+            os.replace(tmp_path, self.status_file)
+
+    def _serve(self, port: int) -> None:
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        progress = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = progress.format_prometheus().encode('utf8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), MetricsHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='nest-metrics', daemon=True).start()
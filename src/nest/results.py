@@ -0,0 +1,266 @@
+import os
+import re
+import csv
+import json
+import time
+import numbers
+import sqlite3
+from typing import Any, List, Dict, Optional, TextIO
+
+
+# built-in columns of the trials table
+COLUMNS = ['run_id', 'trial', 'status', 'started', 'finished', 'elapsed', 'peak_memory', 'config', 'error']
+
+SCHEMA = """\
+CREATE TABLE IF NOT EXISTS trials (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    trial INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    started REAL,
+    finished REAL,
+    elapsed REAL,
+    peak_memory INTEGER,
+    config TEXT,
+    error TEXT,
+    params TEXT,
+    metrics TEXT
+)"""
+
+
+def flatten(obj: Any, prefix: str = '', max_items: int = 256) -> Dict[str, Any]:
+    """Collect scalars of a nested object with dotted keys.
+
+    Parameters:
+        obj:
+            The nested dict / list
+        prefix:
+            Prefix of the keys
+        max_items:
+            Max number of collected scalars
+
+    Returns:
+        The scalars, e.g., {'model.lr': 0.1}
+    """
+
+    flat = dict()
+    stack = [(prefix, obj)]
+    while len(stack) > 0 and len(flat) < max_items:
+        key, val = stack.pop(0)
+        if isinstance(val, dict):
+            stack += [((key + '.' if key else '') + str(k), v) for k, v in val.items() if k != '_var']
+        elif isinstance(val, (list, tuple)):
+            stack += [((key + '.' if key else '') + str(k), v) for k, v in enumerate(val[:max_items])]
+        elif val is None or isinstance(val, (bool, str)):
+            if not isinstance(val, str) or len(val) <= 256:
+                flat[key or 'value'] = val
+        elif isinstance(val, numbers.Number):
+            flat[key or 'value'] = val if isinstance(val, (int, float)) else float(val)
+        elif hasattr(val, 'item') and getattr(val, 'size', None) == 1:
+            # single-element arrays / tensors
+            try:
+                flat[key or 'value'] = val.item()
+            except Exception:
+                pass
+    return flat
+
+
+class ResultStore(object):
+    """Record trials of "run_tasks" to a SQLite database.
+    Records are written in batched transactions, and concurrent writers wait for each other.
+    """
+
+    def __init__(self, path: str, config_file: str, batch_size: int = 16, interval: float = 5.0) -> None:
+        self.path = path
+        self.config_file = os.path.abspath(config_file)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.run_id = time.strftime('%Y%m%d-%H%M%S-') + str(os.getpid())
+        self.pending = []
+        self.last_flush = time.time()
+        self.conn = connect(path)
+
+    def add(
+        self,
+        trial: int,
+        params: Dict[str, Any],
+        status: str,
+        started: float,
+        returns: Any = None,
+        error: Optional[str] = None,
+        peak_memory: Optional[int] = None) -> None:
+        """Add a trial record.
+
+        Parameters:
+            trial:
+                Index of the trial
+            params:
+                Global variables of the trial
+            status:
+                "finished", "failed", or "canceled"
+            started:
+                Start timestamp in seconds
+            returns:
+                Resolved config of the trial
+            error:
+                Error message
+            peak_memory:
+                Peak resident memory of the trial in bytes
+        """
+
+        finished = time.time()
+        self.pending.append((self.run_id, trial, status, started, finished, finished - started, peak_memory, self.config_file, error,
+            json.dumps(flatten(params), default=str), json.dumps(flatten(returns), default=str)))
+        if len(self.pending) >= self.batch_size or finished - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending records.
+        """
+
+        if len(self.pending) > 0:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                self.conn.executemany('INSERT INTO trials (%s, params, metrics) VALUES (%s)' % (
+                    ', '.join(COLUMNS), ', '.join(['?'] * (len(COLUMNS) + 2))), self.pending)
+                self.conn.execute('COMMIT')
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.pending = []
+        self.last_flush = time.time()
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open the results database.
+
+    Parameters:
+        path:
+            Path to the database
+
+    Returns:
+        The connection (in autocommit mode)
+    """
+
+    conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute(SCHEMA)
+    # databases created by earlier versions
+    if not 'peak_memory' in [v[1] for v in conn.execute('PRAGMA table_info(trials)')]:
+        try:
+            conn.execute('ALTER TABLE trials ADD COLUMN peak_memory INTEGER')
+        except sqlite3.OperationalError:
+            # added by a concurrent writer
+            pass
+    return conn
+
+
+def _column_expr(name: str) -> str:
+    if name in COLUMNS:
+        return name
+    if not re.match(r'^[\w.\-]+$', name):
+        raise ValueError('Invalid column "%s".' % name)
+    return 'COALESCE(json_extract(params, \'$."%s"\'), json_extract(metrics, \'$."%s"\'))' % (name, name)
+
+
+def query(
+    path: str,
+    where: List[str] = [],
+    sort: Optional[str] = None,
+    limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Query trial records.
+
+    Parameters:
+        path:
+            Path to the database
+        where:
+            Conditions on built-in, parameter, or metric columns, e.g., ["lr>=0.01", "status=finished"]
+        sort:
+            Sort by the column (descending if it starts with "-")
+        limit:
+            Max number of records
+
+    Returns:
+        The records with parameters and metrics as columns
+    """
+
+    if not os.path.exists(path):
+        raise FileNotFoundError('Could not find the results database "%s".' % path)
+
+    clauses, values = [], []
+    for condition in where:
+        match = re.match(r'^\s*([\w.\-]+)\s*(<=|>=|!=|=|<|>|~)\s*(.*?)\s*$', condition)
+        if match is None:
+            raise ValueError('Invalid condition "%s". Expected "<column><op><value>" with op in (=, !=, <, <=, >, >=, ~).' % condition)
+        name, op, val = match.groups()
+        try:
+            val = float(val)
+        except ValueError:
+            pass
+        if op == '~':
+            clauses.append('%s LIKE ?' % _column_expr(name))
+            val = '%' + str(val) + '%'
+        else:
+            clauses.append('%s %s ?' % (_column_expr(name), op))
+        values.append(val)
+    sql = 'SELECT %s, params, metrics FROM trials' % ', '.join(COLUMNS)
+    if len(clauses) > 0:
+        sql += ' WHERE ' + ' AND '.join(clauses)
+    if sort:
+        sql += ' ORDER BY %s %s' % (_column_expr(sort.lstrip('-')), 'DESC' if sort.startswith('-') else 'ASC')
+    else:
+        sql += ' ORDER BY id'
+    if limit:
+        sql += ' LIMIT %d' % limit
+
+    conn = connect(path)
+    try:
+        rows = []
+        for row in conn.execute(sql, values):
+            record = dict(zip(COLUMNS, row[:len(COLUMNS)]))
+            record.update(json.loads(row[-2] or '{}'))
+            record.update(json.loads(row[-1] or '{}'))
+            rows.append(record)
+        return rows
+    finally:
+        conn.close()
+
+
+def export(rows: List[Dict[str, Any]], columns: List[str], fmt: str, f: TextIO) -> None:
+    """Export trial records.
+
+    Parameters:
+        rows:
+            The records
+        columns:
+            The exported columns
+        fmt:
+            "table", "csv", or "json"
+        f:
+            The output stream
+    """
+
+    if fmt == 'json':
+        json.dump([{k: v.get(k) for k in columns} for v in rows], f, indent=2, default=str)
+        f.write('\n')
+    elif fmt == 'csv':
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([row.get(k) for k in columns])
+    elif fmt == 'table':
+        # helper function
+        def format_cell(val):
+            if isinstance(val, float):
+                return '%.6g' % val
+            return '' if val is None else str(val)
+        cells = [columns] + [[format_cell(v.get(k)) for k in columns] for v in rows]
+        widths = [max(len(v[idx]) for v in cells) for idx in range(len(columns))]
+        for row in cells:
+            f.write('  '.join(v.ljust(w) for v, w in zip(row, widths)).rstrip() + '\n')
+    else:
+        raise ValueError('Unknown format "%s". Expected "table", "csv", or "json".' % fmt)
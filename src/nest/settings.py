@@ -1,6 +1,6 @@
 import os
-import yaml
-from typing import Union, Dict, Any
+from copy import deepcopy
+from typing import Union, Dict, Tuple, Any, Optional
 
 
 SETTINGS_DIR = os.path.join(str(os.path.expanduser('~')), '.nest')
@@ -20,6 +20,18 @@ LOGGING_PATH: null
 # User defined search paths {namespace: path} for Nest module auto-discover (default: {})
 SEARCH_PATHS: null
 
+# Minimal level of messages logged to file
+LOGGING_LEVEL: 'WARNING'
+
+# Write the log file in a background thread as JSON lines tagged with trial index and module id
+LOGGING_ASYNC: false
+
+# Rotate the log file when it reaches the size in bytes (0 to disable)
+LOGGING_MAX_BYTES: 0
+
+# Number of rotated log files to keep
+LOGGING_BACKUP_COUNT: 3
+
 # Seperator between namespace and Nest module name
 NAMESPACE_SEP: '.'
 
@@ -29,6 +41,9 @@ NAMESPACE_ORDER_REVERSE: false
 # Module manager update interval (seconds)
 UPDATE_INTERVAL: 1.5
 
+# Freeze the module manager in forked worker processes (no discovery or hot-reload)
+FREEZE_AFTER_FORK: true
+
 # Varaible prefix in Nest config syntax
 VARIABLE_PREFIX: '@'
 
@@ -43,15 +58,88 @@ NAMESPACE_CONFIG_FILENAME: 'nest.yml'
 # Automatically install requirements when install Nest modules
 AUTO_INSTALL_REQUIREMENTS: false
 
+# Cache of downloaded archives and git mirrors shared by installs (default: <user_home>/.nest/cache)
+CACHE_DIR: null
+
+# Clone git repos with the given depth (default: full history)
+GIT_CLONE_DEPTH: null
+
+# Install requirements from the local wheelhouse directory without network (default: PyPI)
+REQUIREMENTS_WHEELHOUSE: null
+
 # Threshold of missing dependency matching
 INSTALL_TIP_THRESHOLD: 0.15
 
+# Check every k-th item of iterator / generator returns of Nest modules as they are consumed (0 to disable)
+RETURNS_CHECK_EVERY: 1
+
+# Record trials of "nest task run" to the SQLite database, e.g., 'nest_results.db' (relative to the config file, null disables recording)
+RESULTS_DB: null
+
+# Log the top k allocators (traced by tracemalloc) of each trial of "nest task run" (0 to disable)
+TRACEMALLOC_TOP: 0
+
+# Record call statistics of Nest modules (can also be enabled by the env var NEST_PROFILE_CALLS=1)
+PROFILE_CALLS: false
+
+# Save path of the call statistics (default: <user_home>/.nest/stats.json)
+CALL_STATS_PATH: null
+
+# Unix socket path of the "nest serve" daemon (default: <user_home>/.nest/nest.sock)
+DAEMON_SOCKET: null
+
 # Internel debug flags
 # Raises errors instead of warnings
 RAISES_ERROR: false
 """
 
 
+# parsed documents {path: (mtime, size, doc, raw)}
+_yaml_cache = dict()
+_default_settings = None
+
+
+def parse_yaml_string(raw: str) -> Any:
+    """Parse yaml string with the libyaml based loader if available.
+
+    Parameters:
+        raw:
+            The yaml string
+
+    Returns:
+        The parsed document
+    """
+
+    import yaml
+
+    return yaml.load(raw, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def parse_yaml(path: str) -> Tuple[Any, str]:
+    """Parse yaml file with a process-level cache.
+    The cached document is shared, so it must not be modified by the caller.
+
+    Parameters:
+        path:
+            The path to the file
+
+    Returns:
+        The parsed document
+        Raw string
+    """
+
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    cached = _yaml_cache.get(path)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2], cached[3]
+    with open(path, 'r') as f:
+        raw = f.read()
+    doc = parse_yaml_string(raw)
+    _yaml_cache[path] = (stat.st_mtime_ns, stat.st_size, doc, raw)
+    return doc, raw
+
+
 class SettingManager(object):
 
     @staticmethod
@@ -65,6 +153,8 @@ class SettingManager(object):
                 The settings dict or string
         """
 
+        import yaml
+
         with open(path, 'w') as f:
             if isinstance(settings, str):
                 f.write(settings)
@@ -90,21 +180,33 @@ class SettingManager(object):
             SettingManager.save_settings(SETTINGS_FILE, '# User custom settings')
 
         # load settings
-        settings = yaml.load(DEFAULT_SETTINGS)
-        with open(SETTINGS_FILE, 'r') as f:
-            user_settings = yaml.load(f) or dict()
-            settings.update(user_settings)
+        global _default_settings
+        if _default_settings is None:
+            _default_settings = parse_yaml_string(DEFAULT_SETTINGS)
+        settings = deepcopy(_default_settings)
+        user_settings = deepcopy(parse_yaml(SETTINGS_FILE)[0]) or dict()
+        settings.update(user_settings)
 
         # handle defaults
         if settings['LOGGING_PATH'] is None:
             settings['LOGGING_PATH'] = os.path.join(SETTINGS_DIR, 'nest.log')
         if settings['SEARCH_PATHS'] is None:
             settings['SEARCH_PATHS'] = dict()
+        if settings['CACHE_DIR'] is None:
+            settings['CACHE_DIR'] = os.path.join(SETTINGS_DIR, 'cache')
+        if settings['CALL_STATS_PATH'] is None:
+            settings['CALL_STATS_PATH'] = os.path.join(SETTINGS_DIR, 'stats.json')
+        if settings['DAEMON_SOCKET'] is None:
+            settings['DAEMON_SOCKET'] = os.path.join(SETTINGS_DIR, 'nest.sock')
 
         return settings, user_settings
 
-    def __init__(self):
-        self.load()
+    def __getattr__(self, key: str):
+        # settings are loaded on first use
+        if key in ('settings', 'user_settings'):
+            self.load()
+            return self.__dict__[key]
+        raise AttributeError(key)
     
     def __getitem__(self, key: str):
         return self.settings[key]
@@ -115,14 +217,38 @@ class SettingManager(object):
     def __contains__(self, key):
         return key in self.settings.keys()
 
+    @staticmethod
+    def _file_key() -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(SETTINGS_FILE)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
     def load(self):
-        self.settings, self.user_settings = SettingManager.load_settings()
+        try:
+            self.settings, self.user_settings = SettingManager.load_settings()
+        except Exception as exc_info:
+            raise RuntimeError('Unable to load global settings of Nest. %s' % exc_info)
+        self.file_key = SettingManager._file_key()
+
+    def refresh(self) -> bool:
+        """Reload the settings if the settings file is changed (e.g., by another process).
+
+        Returns:
+            True if the settings are reloaded, otherwise False
+        """
+
+        if not 'settings' in self.__dict__:
+            # not loaded yet
+            return False
+        if SettingManager._file_key() == self.file_key:
+            return False
+        self.load()
+        return True
     
     def save(self):
         SettingManager.save_settings(SETTINGS_FILE, self.user_settings)
 
-# load global settings
-try:
-    settings = SettingManager()
-except Exception as exc_info:
-    raise RuntimeError('Unable to load global settings of Nest. %s' % exc_info)
+# global settings (loaded on first use)
+settings = SettingManager()
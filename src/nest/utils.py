@@ -4,13 +4,11 @@ import string
 import inspect
 import collections
 import warnings
-from typing import List, Set, Dict, Tuple, Callable, Any, Union, Iterable, Iterator
-
-import yaml
-from dateutil.relativedelta import relativedelta
+from copy import deepcopy
+from typing import List, Set, Dict, Tuple, Callable, Any, Union, Iterable, Iterator, Optional
 
 from nest.logger import exception
-from nest.settings import settings
+from nest.settings import settings, parse_yaml
 
 
 # helper functions
@@ -25,6 +23,8 @@ def yaml_format(obj: object) -> str:
         formated string
     """
 
+    import yaml
+
     return yaml.dump(obj, default_flow_style=False)
 
 
@@ -39,26 +39,97 @@ def format_elapse(**elapse) -> str:
         Human readable string
     """
 
+    from dateutil.relativedelta import relativedelta
+
     attrs = ['years', 'months', 'days', 'hours', 'minutes', 'seconds']
     elapse = relativedelta(**elapse)
     return ', '.join(['%d %s' % (getattr(elapse, attr), getattr(elapse, attr) > 1 and attr or attr[:-1]) for attr in attrs if getattr(elapse, attr)])
 
 
-def load_yaml(path: str) -> Tuple[dict, str]:
+def load_yaml(path: str, copy: bool = True) -> Tuple[dict, str]:
     """Load yaml file.
+    Each file is parsed once per process unless its mtime or size changes.
 
     Parameters:
         path:
             The path to the file
+        copy:
+            Return a private copy of the cached document. 
+            Set to False only if the result will not be modified.
 
     Returns:
         The dict
         Raw string
     """
 
-    with open(path, 'r') as f:
-        raw = ''.join(f.readlines())
-        return yaml.load(raw), raw
+    doc, raw = parse_yaml(path)
+    return (deepcopy(doc) if copy else doc), raw
+
+
+def get_memory_usage() -> Optional[int]:
+    """Get memory usage of the current process.
+
+    Returns:
+        Resident set size in bytes (peak size if the current size is unavailable, None if unsupported)
+    """
+
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+
+def reset_peak_memory_usage() -> bool:
+    """Reset the peak memory usage of the current process (Linux only).
+
+    Returns:
+        True if the peak is reset, otherwise False
+    """
+
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def get_peak_memory_usage() -> Optional[int]:
+    """Get peak memory usage of the current process since the last reset (Linux only).
+
+    Returns:
+        Peak resident set size in bytes (None if unsupported)
+    """
+
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def release_memory() -> None:
+    """Collect garbage and return the freed heap memory to the OS (glibc only).
+    """
+
+    import gc
+
+    gc.collect()
+    try:
+        import ctypes
+        ctypes.CDLL('libc.so.6').malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
 
 
 def indent_text(text: str, indent: int) -> str:
@@ -162,7 +233,7 @@ def merge_dict(
 @exception
 def is_annotation_matched(var: object, annotation: object) -> bool:
     """Return True if annotation is matched with the given variable.
-    {Any, List, Set, Tuple, Dict, Union, Callable, Iterable, Iterator} from "typing" are supported. 
+    {Any, List, Set, Tuple, Dict, Union, Callable, Iterable, Iterator, Generator} from "typing" are supported. 
     
     Parameters:
         var: 
@@ -204,11 +275,13 @@ def is_annotation_matched(var: object, annotation: object) -> bool:
             else:
                 return False
         elif anno_type == 'Iterable':
-            # currently we can't check the type of items
+            # items are checked lazily when consumed (see NestModule._check_returns)
             return issubclass(var_type, collections.abc.Iterable)
         elif anno_type == 'Iterator':
-            # currently we can't check the type of items
+            # items are checked lazily when consumed (see NestModule._check_returns)
             return issubclass(var_type, collections.abc.Iterator)
+        elif anno_type == 'Generator':
+            return issubclass(var_type, collections.abc.Generator)
         elif anno_type == 'Tuple':
             sub_annotation = annotation.__args__
             if var_type == tuple:
@@ -0,0 +1,6 @@
+import os
+import sys
+
+
+# test the package in the source tree
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
@@ -0,0 +1,41 @@
+import os
+import re
+import sys
+import subprocess
+
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+# budget of the cumulative import time of nest in microseconds
+IMPORT_TIME_BUDGET = 500000
+
+
+def run_python(code, home):
+    env = dict(os.environ, HOME=home, PYTHONPATH=SRC_DIR)
+    env.pop('NEST_PROFILE_CALLS', None)
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+
+def test_import_time(tmp_path):
+    proc = run_python('import nest', str(tmp_path))
+    # lines of "import time: self [us] | cumulative | imported package"
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        match = re.match(r'^import time:\s*\d+\s*\|\s*(\d+)\s*\|\s*nest$', line)
+        if match:
+            cumulative = int(match.group(1))
+    assert cumulative is not None
+    assert cumulative < IMPORT_TIME_BUDGET, 'import nest took %d us' % cumulative
+
+
+def test_import_is_lazy(tmp_path):
+    code = '\n'.join([
+        'import sys',
+        'import nest',
+        'settings_module = sys.modules["nest.settings"]',
+        'assert "yaml" not in sys.modules, "yaml is imported"',
+        'assert len(settings_module._yaml_cache) == 0, "yaml is parsed"',
+        'assert "settings" not in vars(settings_module.settings), "settings are loaded"',
+    ])
+    run_python(code, str(tmp_path))
+    assert not os.path.exists(os.path.join(str(tmp_path), '.nest'))
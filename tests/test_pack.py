@@ -0,0 +1,49 @@
+import os
+import json
+import zipfile
+
+import pytest
+
+from nest.modules import ModuleManager, PACK_MANIFEST
+
+
+def make_pack(path, members, manifest):
+    with zipfile.ZipFile(path, 'w') as f:
+        for name, data in members.items():
+            f.writestr(name, data)
+        f.writestr(PACK_MANIFEST, json.dumps(manifest))
+
+
+def test_pack_round_trip(tmp_path):
+    src = tmp_path / 'src' / 'ns'
+    (src / 'sub').mkdir(parents=True)
+    (src / 'a.py').write_text('x = 1\n')
+    (src / 'sub' / 'b.py').write_text('x = 1\n')
+    pack_path = str(tmp_path / 'pack.zip')
+    ModuleManager._pack_namespaces([str(src)], pack_path)
+    with zipfile.ZipFile(pack_path) as f:
+        assert f.testzip() is None
+        assert ModuleManager._extract_pack(f, str(tmp_path / 'dst')) == {'ns'}
+    assert (tmp_path / 'dst' / 'ns' / 'sub' / 'b.py').read_text() == 'x = 1\n'
+
+
+@pytest.mark.parametrize('members, manifest', [
+    # copied outside of the destination
+    ({'ns/a.py': 'x'}, dict(namespaces={'ns': []}, files={'ns/../../escaped.py': dict(blob='ns/a.py')})),
+    # host files copied into the namespace
+    ({'ns/a.py': 'x'}, dict(namespaces={'ns': []}, files={'ns/b.py': dict(blob='../../../../etc/hostname')})),
+    # files of unlisted namespaces
+    ({'ns/a.py': 'x'}, dict(namespaces={'ns': []}, files={'other/b.py': dict(blob='ns/a.py')})),
+    # namespaces outside of the destination
+    ({'ns/a.py': 'x'}, dict(namespaces={'..': []}, files={})),
+])
+def test_extract_pack_rejects_unsafe_paths(tmp_path, members, manifest):
+    pack_path = str(tmp_path / 'pack.zip')
+    make_pack(pack_path, members, manifest)
+    dst = tmp_path / 'dst'
+    dst.mkdir()
+    with zipfile.ZipFile(pack_path) as f:
+        with pytest.raises(ValueError):
+            ModuleManager._extract_pack(f, str(dst))
+    assert not (tmp_path / 'escaped.py').exists()
+    assert not (dst / 'ns' / 'b.py').exists()
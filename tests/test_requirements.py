@@ -0,0 +1,25 @@
+import pytest
+
+from nest.modules import ModuleManager
+
+
+@pytest.mark.parametrize('dep, expected', [
+    ('numpy>=1.16', ('pip', 'numpy>=1.16')),
+    ({'tool': 'pip', 'url': 'git+https://github.com/org/repo.git'}, ('pip', 'git+https://github.com/org/repo.git')),
+    ({'tool': 'conda', 'url': 'numpy'}, ('conda', 'numpy')),
+])
+def test_parse_requirement(dep, expected):
+    assert ModuleManager._parse_requirement(dep) == expected
+
+
+@pytest.mark.parametrize('dep', [
+    'numpy; os.system("x")',
+    {'tool': 'pip', 'url': '--index-url=https://evil.example/simple'},
+    {'tool': 'pip', 'url': 'numpy --user'},
+    {'tool': 'pip', 'url': ''},
+    {'tool': 'http.server', 'url': 'numpy'},
+    {'tool': 'pip'},
+    ['pip', 'numpy'],
+])
+def test_parse_requirement_rejects_unsafe(dep):
+    assert ModuleManager._parse_requirement(dep) is None